@@ -29,6 +29,11 @@ class Settings(BaseSettings):
     results_dir: Path = Path("./results")
     temp_dir: Path = Path("./temp")
     
+    # Processing Configuration
+    processing_workers: int = 2  # Documents processed concurrently per server process
+    analysis_cache_size: int = 1024  # Analysis records kept in memory; older ones spill to disk
+    meta_analysis_window: int = 10000  # Most recent analyses retained for meta-analysis
+    
     # CORS Configuration - Allow specific origins + wildcards for development
     cors_origins: List[str] = [
         "http://localhost:3000",
@@ -46,6 +51,7 @@ class Settings(BaseSettings):
     from_email: str = ""
     admin_email: str = ""
     send_reports_automatically: bool = False  # If True, sends reports immediately; if False, admin reviews first
+    email_workers: int = 8  # Emails sent at once; each may hold its own SMTP session
     
     # Security
     secret_key: str = "change-this-in-production"
@@ -54,6 +60,8 @@ class Settings(BaseSettings):
     host: str = "0.0.0.0"
     port: int = 8000
     reload: bool = True
+    server_loop: str = "auto"  # uvloop when installed, asyncio otherwise (e.g. Windows)
+    server_http: str = "auto"  # httptools when installed, h11 otherwise
     
     class Config:
         env_file = ".env"
@@ -0,0 +1,314 @@
+"""
+Bounded storage for analysis results
+"""
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+
+from .utils import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Analysis IDs are UUID strings; anything else is never looked up on disk
+_VALID_ID = re.compile(r"^[A-Za-z0-9-]+$")
+
+def _json_default(value: Any) -> Any:
+    """Serialize values the json module can't handle (enums, paths, ...)"""
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+class AnalysisStore(MutableMapping):
+    """
+    LRU-bounded mapping of analysis_id -> analysis record.
+
+    At most ``maxsize`` records are kept in memory. When an insert pushes the
+    store past that limit, the least recently used record is written to
+    ``spill_dir/<analysis_id>.json`` and dropped from memory. Spilled records
+    are loaded back transparently the next time they are looked up.
+
+    The bulky ``document_data`` field is written once to a separate
+    ``<analysis_id>.data.json`` file, so rewriting a record to flip a small
+    field (status, email flags) doesn't re-serialize the parsed document.
+    Records loaded back from disk leave it out; ``await document_data()``
+    reads it on demand.
+
+    Records can also be written through with ``await persist()``. Server
+    processes sharing ``spill_dir`` then see each other's analyses: a record
+    loaded with ``await load()`` is re-read once its file changes, checked at
+    most every ``recheck_interval`` seconds.
+
+    All disk writes run on a single background writer thread, keeping JSON
+    encoding off the event loop while preserving write order per record.
+    Async code should look records up with ``await load()``, which reads
+    misses in a worker thread; plain ``[]``/``in`` lookups only stay off the
+    disk for records held in memory.
+    """
+
+    def __init__(
+        self,
+        spill_dir: Path,
+        maxsize: int = 1024,
+        restore: Optional[Callable[[Dict], Dict]] = None,
+        recheck_interval: float = 1.0
+    ):
+        """
+        Args:
+            spill_dir: Directory that evicted records are written to
+            maxsize: Maximum number of records held in memory
+            restore: Optional hook applied to records loaded back from disk
+            recheck_interval: Seconds a staleness/existence check on disk is reused
+        """
+        self.spill_dir = Path(spill_dir)
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        self.maxsize = maxsize
+        self.restore = restore
+        self.recheck_interval = recheck_interval
+        self._records: "OrderedDict[str, Dict]" = OrderedDict()
+        # mtime of the file each disk-loaded record was read from
+        self._loaded_mtimes: Dict[str, int] = {}
+        # Evicted records whose spill hasn't finished yet
+        self._pending_spills: Dict[str, Dict] = {}
+        # analysis_id -> monotonic time its file was last checked for changes
+        self._stale_checked = LRUCache(maxsize=maxsize)
+        # analysis_id -> (monotonic check time, whether a spill file exists)
+        self._on_disk = LRUCache(maxsize=maxsize)
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="analysis-store")
+
+    def _spill_path(self, analysis_id: str) -> Optional[Path]:
+        if not _VALID_ID.match(analysis_id):
+            return None
+        return self.spill_dir / f"{analysis_id}.json"
+
+    def _data_path(self, analysis_id: str) -> Path:
+        return self.spill_dir / f"{analysis_id}.data.json"
+
+    @staticmethod
+    def _write_json(path: Path, value: Any):
+        """Write JSON atomically, replacing any previous copy"""
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(value, f, default=_json_default)
+        os.replace(tmp_path, path)
+
+    def _spill(self, analysis_id: str, record: Dict):
+        """Write a record to disk (runs on the writer thread)"""
+        path = self._spill_path(analysis_id)
+        if path is None:
+            return
+        record = dict(record)
+        document_data = record.pop("document_data", None)
+        try:
+            # document_data never changes once set, so it is only written once
+            data_path = self._data_path(analysis_id)
+            if document_data is not None and not data_path.exists():
+                self._write_json(data_path, document_data)
+            self._write_json(path, record)
+        except Exception as e:
+            logger.error(f"Failed to write analysis {analysis_id} to disk: {e}")
+
+    def _spill_evicted(self, analysis_id: str, record: Dict, loaded_mtime: Optional[int]):
+        """Write an evicted record to disk (runs on the writer thread)"""
+        if self._pending_spills.get(analysis_id) is not record:
+            return  # deleted while queued
+        try:
+            on_disk = self._spill_path(analysis_id).stat().st_mtime_ns
+        except FileNotFoundError:
+            on_disk = None
+        # Never overwrite a newer copy written by another process
+        if loaded_mtime is None or on_disk in (None, loaded_mtime):
+            self._spill(analysis_id, record)
+        if self._pending_spills.get(analysis_id) is record:
+            del self._pending_spills[analysis_id]
+
+    def _read(self, analysis_id: str, unless_mtime: Optional[int] = None) -> Optional[Tuple[int, Optional[Dict]]]:
+        """
+        (mtime, record) from disk, or None if there isn't one. The record is
+        None when the file's mtime still equals unless_mtime. Touches no
+        shared state, so it is safe to run in a worker thread.
+        """
+        path = self._spill_path(analysis_id)
+        if path is None:
+            return None
+        try:
+            mtime = path.stat().st_mtime_ns
+            if mtime == unless_mtime:
+                return mtime, None
+            with open(path, "r", encoding="utf-8") as f:
+                record = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.error(f"Failed to load analysis {analysis_id} from disk: {e}")
+            return None
+        return mtime, self.restore(record) if self.restore else record
+
+    def _load(self, analysis_id: str) -> Optional[Dict]:
+        """Load a record from disk on the calling thread, or None if there isn't one"""
+        read = self._read(analysis_id)
+        if read is None:
+            return None
+        self._loaded_mtimes[analysis_id] = read[0]
+        return read[1]
+
+    def _recheck_due(self, analysis_id: str) -> bool:
+        """True (and restarts the interval) if a disk-loaded record should be re-checked"""
+        now = time.monotonic()
+        if now - self._stale_checked.get(analysis_id, float("-inf")) < self.recheck_interval:
+            return False
+        self._stale_checked[analysis_id] = now
+        return True
+
+    async def load(self, analysis_id: str) -> Optional[Dict]:
+        """The record for analysis_id, or None; any disk access runs in a worker thread"""
+        record = self._records.get(analysis_id)
+        if record is not None:
+            loaded_mtime = self._loaded_mtimes.get(analysis_id)
+            if loaded_mtime is None or not self._recheck_due(analysis_id):
+                self._records.move_to_end(analysis_id)
+                return record
+            read = await asyncio.to_thread(self._read, analysis_id, loaded_mtime)
+            # Keep the in-memory copy if the file is unchanged or gone, or if
+            # this process wrote the record while the check was running
+            if read is None or read[1] is None or self._loaded_mtimes.get(analysis_id) != loaded_mtime:
+                return self._records.get(analysis_id, record)
+        else:
+            record = self._pending_spills.get(analysis_id)
+            if record is not None:
+                self._insert(analysis_id, record)
+                return record
+            if not _VALID_ID.match(analysis_id) or self._cached_on_disk(analysis_id) is False:
+                return None
+            read = await asyncio.to_thread(self._read, analysis_id)
+            if analysis_id in self._records:
+                return self._records[analysis_id]
+            if read is None:
+                self._on_disk[analysis_id] = (time.monotonic(), False)
+                return None
+        mtime, record = read
+        self._loaded_mtimes[analysis_id] = mtime
+        self._insert(analysis_id, record)
+        return record
+
+    async def document_data(self, analysis_id: str) -> Optional[Dict]:
+        """The record's parsed document, read from its data file if not held in memory"""
+        record = await self.load(analysis_id)
+        if record is None:
+            return None
+        if "document_data" in record:
+            return record["document_data"]
+        data_path = self._data_path(analysis_id)
+
+        def read_data():
+            try:
+                with open(data_path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except FileNotFoundError:
+                return None
+
+        return await asyncio.to_thread(read_data)
+
+    async def persist(self, analysis_id: str):
+        """Write a record through to disk so other processes can read it"""
+        record = self._records.get(analysis_id)
+        if record is None:
+            return
+        # This process is now the writer; its in-memory copy is authoritative
+        self._loaded_mtimes.pop(analysis_id, None)
+        # Snapshot on the loop so the writer never sees a dict mid-update
+        await asyncio.wrap_future(self._writer.submit(self._spill, analysis_id, dict(record)))
+
+    def close(self):
+        """Wait for queued disk writes to finish"""
+        self._writer.shutdown(wait=True)
+
+    def __getitem__(self, analysis_id: str) -> Dict:
+        record = self._records.get(analysis_id)
+        if record is not None:
+            self._records.move_to_end(analysis_id)
+            return record
+
+        record = self._pending_spills.get(analysis_id)
+        if record is None and self._cached_on_disk(analysis_id) is not False:
+            record = self._load(analysis_id)
+        if record is None:
+            self._on_disk[analysis_id] = (time.monotonic(), False)
+            raise KeyError(analysis_id)
+        self._insert(analysis_id, record)
+        return record
+
+    def _cached_on_disk(self, analysis_id: str) -> Optional[bool]:
+        """Recent answer to "is there a spill file?", or None if unknown"""
+        cached = self._on_disk.get(analysis_id)
+        if cached is None or time.monotonic() - cached[0] >= self.recheck_interval:
+            return None
+        return cached[1]
+
+    def __setitem__(self, analysis_id: str, record: Dict):
+        self._loaded_mtimes.pop(analysis_id, None)
+        self._insert(analysis_id, record)
+
+    def _insert(self, analysis_id: str, record: Dict):
+        self._on_disk.pop(analysis_id, None)
+        self._records[analysis_id] = record
+        self._records.move_to_end(analysis_id)
+        while len(self._records) > self.maxsize:
+            evicted_id, evicted = self._records.popitem(last=False)
+            loaded_mtime = self._loaded_mtimes.pop(evicted_id, None)
+            self._pending_spills[evicted_id] = evicted
+            self._on_disk.pop(evicted_id, None)
+            self._writer.submit(self._spill_evicted, evicted_id, evicted, loaded_mtime)
+
+    def __delitem__(self, analysis_id: str):
+        self._loaded_mtimes.pop(analysis_id, None)
+        self._on_disk.pop(analysis_id, None)
+        found = self._records.pop(analysis_id, None) is not None
+        found = self._pending_spills.pop(analysis_id, None) is not None or found
+        if not found and analysis_id not in self:
+            raise KeyError(analysis_id)
+        self._on_disk[analysis_id] = (time.monotonic(), False)
+        if self._spill_path(analysis_id) is not None:
+            # Queued behind any pending write of the record, so it can't resurrect it
+            self._writer.submit(self._unlink, analysis_id)
+
+    def _unlink(self, analysis_id: str):
+        """Remove a record's files (runs on the writer thread)"""
+        self._spill_path(analysis_id).unlink(missing_ok=True)
+        self._data_path(analysis_id).unlink(missing_ok=True)
+
+    def __contains__(self, analysis_id: object) -> bool:
+        if analysis_id in self._records or analysis_id in self._pending_spills:
+            return True
+        if not isinstance(analysis_id, str):
+            return False
+        cached = self._cached_on_disk(analysis_id)
+        if cached is not None:
+            return cached
+        path = self._spill_path(analysis_id)
+        exists = path is not None and path.exists()
+        self._on_disk[analysis_id] = (time.monotonic(), exists)
+        return exists
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the IDs of records currently held in memory"""
+        return iter(list(self._records))
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def values(self) -> List[Dict]:
+        """In-memory records, without touching their LRU position"""
+        return list(self._records.values())
+
+    def items(self) -> List[Tuple[str, Dict]]:
+        """In-memory (id, record) pairs, without touching their LRU position"""
+        return list(self._records.items())
@@ -5,6 +5,8 @@ Email service for sending reports and notifications
 import smtplib
 import ssl
 import logging
+import threading
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.application import MIMEApplication
@@ -14,6 +16,10 @@ from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Reconnect rather than reuse an SMTP session idle for longer than this
+# (servers typically drop idle clients after a few minutes)
+SMTP_IDLE_TIMEOUT = 60
+
 class EmailService:
     """Service for handling email notifications"""
     
@@ -27,6 +33,13 @@ class EmailService:
         self.from_email = settings.from_email or settings.smtp_user
         self.admin_email = settings.admin_email
         self.use_tls = getattr(settings, 'smtp_use_tls', True)
+        # Pool of idle logged-in SMTP sessions as (session, last_used) pairs.
+        # Each send checks one out, so up to max_sessions sends run at once;
+        # _pool_lock only guards the list, never a network exchange.
+        self.max_sessions = max(1, getattr(settings, 'email_workers', 8))
+        self._idle_sessions = []
+        self._pool_lock = threading.Lock()
+        self._session_slots = threading.BoundedSemaphore(self.max_sessions)
         
     def is_configured(self) -> bool:
         """Check if email service is properly configured"""
@@ -37,6 +50,83 @@ class EmailService:
             self.smtp_password
         )
     
+    def _connect(self) -> smtplib.SMTP:
+        """Open and log in a new SMTP session"""
+        # Use SSL for port 465, STARTTLS for port 587
+        if self.smtp_port == 465:
+            # SSL connection
+            context = ssl.create_default_context()
+            server = smtplib.SMTP_SSL(self.smtp_host, self.smtp_port, context=context, timeout=30)
+        else:
+            # STARTTLS connection (port 587)
+            server = smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=30)
+            if self.use_tls:
+                server.starttls()
+        server.login(self.smtp_user, self.smtp_password)
+        return server
+    
+    @staticmethod
+    def _quit(server: smtplib.SMTP):
+        """Close an SMTP session, ignoring errors from a dead connection"""
+        try:
+            server.quit()
+        except Exception:
+            pass
+    
+    def _checkout(self) -> Optional[smtplib.SMTP]:
+        """Take the most recently used idle session, dropping expired ones"""
+        expired = []
+        server = None
+        now = time.monotonic()
+        with self._pool_lock:
+            while self._idle_sessions:
+                candidate, last_used = self._idle_sessions.pop()
+                if now - last_used <= SMTP_IDLE_TIMEOUT:
+                    server = candidate
+                    break
+                expired.append(candidate)
+        for stale in expired:
+            self._quit(stale)
+        return server
+    
+    def _checkin(self, server: smtplib.SMTP):
+        """Return a healthy session to the idle pool"""
+        with self._pool_lock:
+            self._idle_sessions.append((server, time.monotonic()))
+    
+    def _deliver(self, msg: MIMEMultipart):
+        """
+        Send a message over a pooled SMTP session.
+        
+        The TLS handshake and login are paid once per session and reused by
+        later sends. A session the server has closed is replaced and the send
+        retried once.
+        """
+        with self._session_slots:
+            server = self._checkout()
+            for attempt in range(2):
+                if server is None:
+                    server = self._connect()
+                try:
+                    server.send_message(msg)
+                    break
+                except smtplib.SMTPServerDisconnected:
+                    server = None
+                    if attempt:
+                        raise
+                except Exception:
+                    # Don't pool a session left in a half-finished transaction
+                    self._quit(server)
+                    raise
+            self._checkin(server)
+    
+    def close(self):
+        """Close all idle SMTP sessions"""
+        with self._pool_lock:
+            sessions, self._idle_sessions = self._idle_sessions, []
+        for server, _ in sessions:
+            self._quit(server)
+    
     def _send_email(
         self,
         to_email: str,
@@ -60,34 +150,23 @@ class EmailService:
             # Add HTML body
             msg.attach(MIMEText(body_html, 'html'))
             
-            # Add attachments
+            # Add attachments (missing files are skipped)
             if attachments:
-                for file_path in attachments:
-                    if file_path.exists():
+                for file_path in map(Path, attachments):
+                    try:
                         with open(file_path, 'rb') as f:
                             attachment = MIMEApplication(f.read())
-                            attachment.add_header(
-                                'Content-Disposition',
-                                'attachment',
-                                filename=file_path.name
-                            )
-                            msg.attach(attachment)
+                    except FileNotFoundError:
+                        continue
+                    attachment.add_header(
+                        'Content-Disposition',
+                        'attachment',
+                        filename=file_path.name
+                    )
+                    msg.attach(attachment)
             
-            # Connect and send
-            # Use SSL for port 465, STARTTLS for port 587
-            if self.smtp_port == 465:
-                # SSL connection
-                context = ssl.create_default_context()
-                with smtplib.SMTP_SSL(self.smtp_host, self.smtp_port, context=context, timeout=30) as server:
-                    server.login(self.smtp_user, self.smtp_password)
-                    server.send_message(msg)
-            else:
-                # STARTTLS connection (port 587)
-                with smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=30) as server:
-                    if self.use_tls:
-                        server.starttls()
-                    server.login(self.smtp_user, self.smtp_password)
-                    server.send_message(msg)
+            # Send over the shared session
+            self._deliver(msg)
                 
             logger.info(f"Email sent successfully to {to_email}")
             return True
@@ -167,7 +246,7 @@ class EmailService:
             to_email=to_email,
             subject=subject,
             body_html=body_html,
-            attachments=[report_path] if report_path.exists() else None
+            attachments=[report_path]
         )
     
     def send_admin_notification(
@@ -292,7 +371,7 @@ class EmailService:
             to_email=self.admin_email,
             subject=subject,
             body_html=body_html,
-            attachments=[report_path] if report_path.exists() else None
+            attachments=[report_path]
         )
 
     def send_lake_assessment_notification(
@@ -367,15 +446,11 @@ class EmailService:
         """
         
         # Attach the Lake Assessment report
-        attachments = []
-        if Path(report_path).exists():
-            attachments.append(report_path)
-        
         return self._send_email(
             to_email=customer_email,
             subject=subject,
             body_html=body_html,
-            attachments=attachments
+            attachments=[report_path]
         )
 
 def initialize_email_service(settings):
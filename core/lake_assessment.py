@@ -3,6 +3,7 @@ Lake Assessment Module - Multi-Year Trend Analysis
 Automatically performs trend analysis when 3+ reports from the same lake are submitted
 """
 
+import functools
 import re
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
@@ -12,6 +13,116 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# How much of the document text is searched for a lake name or year
+TEXT_SEARCH_CHARS = 2000
+
+# Common lake name patterns
+LAKE_PATTERNS = [
+    re.compile(r'(\w+\s+Lake)', re.IGNORECASE),  # "Austin Lake"
+    re.compile(r'Lake\s+(\w+)', re.IGNORECASE),  # "Lake Michigan"
+    re.compile(r'(\w+)\s+Lake', re.IGNORECASE),  # "Paradise Lake"
+    re.compile(r'(Lake\s+\w+)', re.IGNORECASE),  # "Lake Monticello"
+]
+
+# 4-digit years in filenames
+YEAR_PATTERNS = [
+    re.compile(r'(20\d{2})'),  # 2000-2099
+    re.compile(r'(19\d{2})'),  # 1900-1999
+]
+
+# MMDDYY dates in filenames (071620 = July 16, 2020)
+MMDDYY_PATTERN = re.compile(r'(\d{2})(\d{2})(\d{2})')
+
+# Report date, monitoring year, etc. in document text
+DATE_CONTEXT_PATTERNS = [
+    re.compile(r'Report\s+Date[:\s]+.*?(20\d{2}|19\d{2})', re.IGNORECASE),
+    re.compile(r'Monitoring\s+Year[:\s]+.*?(20\d{2}|19\d{2})', re.IGNORECASE),
+    re.compile(r'Data\s+from[:\s]+.*?(20\d{2}|19\d{2})', re.IGNORECASE),
+    re.compile(r'Annual\s+Report\s+(20\d{2}|19\d{2})', re.IGNORECASE),
+    re.compile(r'(20\d{2})'),  # Fallback: any 4-digit year in text
+]
+
+FILENAME_YEAR_PATTERN = re.compile(r'_?\d{4}_?')
+UNDERSCORE_RUN_PATTERN = re.compile(r'_+')
+
+@functools.lru_cache(maxsize=256)
+def _extract_lake_name_and_year(filename: str, text: str) -> Tuple[Optional[str], Optional[int], bool]:
+    """
+    Lake name and year for a filename and the start of its text, plus whether
+    the name is the filename fallback. Cached: the same reports are looked at
+    again by every grouping pass, so logging is left to the caller.
+    """
+    # Try to extract from filename first
+    lake_name = None
+    year = None
+    fallback_name = False
+    
+    for pattern in LAKE_PATTERNS:
+        match = pattern.search(filename)
+        if match:
+            lake_name = match.group(0).strip()
+            break
+    
+    # If not in filename, try document text (first 2000 chars for better coverage)
+    if not lake_name and text:
+        for pattern in LAKE_PATTERNS:
+            match = pattern.search(text)
+            if match:
+                lake_name = match.group(0).strip()
+                break
+    
+    # Fallback: Use the project/organization name from filename
+    # Handles cases like "PLEON_TWCWC_2021_report.pdf"
+    if not lake_name:
+        # Try to extract a project identifier from filename
+        # Remove year, "report", "final", etc. and use what's left
+        clean_filename = filename.replace('.pdf', '').replace('.PDF', '')
+        
+        # Remove common suffixes
+        for suffix in ['_report', '_final', '_FINAL', ' report', ' Report', '_Report', 
+                      '(1)', '(2)', '(3)', '_copy', ' copy', ' Copy', '-Copy']:
+            clean_filename = clean_filename.replace(suffix, '')
+        
+        # Remove year patterns
+        clean_filename = FILENAME_YEAR_PATTERN.sub('_', clean_filename)
+        clean_filename = UNDERSCORE_RUN_PATTERN.sub('_', clean_filename)  # Collapse multiple underscores
+        clean_filename = clean_filename.strip('_- ')
+        
+        if clean_filename and len(clean_filename) > 2:
+            # Use the cleaned filename as the lake/project identifier
+            lake_name = clean_filename.replace('_', ' ').strip()
+            fallback_name = True
+    
+    # Try filename first - look for 4-digit years
+    for pattern in YEAR_PATTERNS:
+        matches = pattern.findall(filename)
+        if matches:
+            # Take the most recent year if multiple found
+            year = max(int(y) for y in matches)
+            break
+    
+    # If no 4-digit year found, try date formats like MMDDYY (071620 = July 16, 2020)
+    if not year:
+        date_match = MMDDYY_PATTERN.search(filename)
+        if date_match:
+            mm, dd, yy = date_match.groups()
+            # Convert 2-digit year to 4-digit
+            yy_int = int(yy)
+            if yy_int >= 0 and yy_int <= 30:
+                year = 2000 + yy_int  # 00-30 -> 2000-2030
+            elif yy_int > 30 and yy_int <= 99:
+                year = 1900 + yy_int  # 31-99 -> 1931-1999
+    
+    # If not in filename, check document text
+    if not year and text:
+        for pattern in DATE_CONTEXT_PATTERNS:
+            match = pattern.search(text)
+            if match:
+                year = int(match.group(1))
+                break
+    
+    return lake_name, year, fallback_name
+
 
 class LakeAssessment:
     """Performs multi-year trend analysis for lake data"""
@@ -29,105 +140,16 @@ class LakeAssessment:
         Returns:
             Tuple of (lake_name, year) or (None, None) if not found
         """
-        filename = doc_data.get('filename', '')
-        text = doc_data.get('text', '')
-        
-        # Try to extract from filename first
-        lake_name = None
-        year = None
-        
-        # Common lake name patterns in filename
-        lake_patterns = [
-            r'(\w+\s+Lake)',  # "Austin Lake"
-            r'Lake\s+(\w+)',  # "Lake Michigan"
-            r'(\w+)\s+Lake',  # "Paradise Lake"
-            r'(Lake\s+\w+)',  # "Lake Monticello"
-        ]
-        
-        for pattern in lake_patterns:
-            match = re.search(pattern, filename, re.IGNORECASE)
-            if match:
-                lake_name = match.group(0).strip()
-                break
-        
-        # If not in filename, try document text (first 2000 chars for better coverage)
-        if not lake_name and text:
-            for pattern in lake_patterns:
-                match = re.search(pattern, text[:2000], re.IGNORECASE)
-                if match:
-                    lake_name = match.group(0).strip()
-                    break
-        
-        # Fallback: Use the project/organization name from filename
-        # Handles cases like "PLEON_TWCWC_2021_report.pdf"
-        if not lake_name:
-            # Try to extract a project identifier from filename
-            # Remove year, "report", "final", etc. and use what's left
-            clean_filename = filename.replace('.pdf', '').replace('.PDF', '')
-            
-            # Remove common suffixes
-            for suffix in ['_report', '_final', '_FINAL', ' report', ' Report', '_Report', 
-                          '(1)', '(2)', '(3)', '_copy', ' copy', ' Copy', '-Copy']:
-                clean_filename = clean_filename.replace(suffix, '')
-            
-            # Remove year patterns
-            clean_filename = re.sub(r'_?\d{4}_?', '_', clean_filename)
-            clean_filename = re.sub(r'_+', '_', clean_filename)  # Collapse multiple underscores
-            clean_filename = clean_filename.strip('_- ')
-            
-            if clean_filename and len(clean_filename) > 2:
-                # Use the cleaned filename as the lake/project identifier
-                lake_name = clean_filename.replace('_', ' ').strip()
-                logger.info(f"Using fallback lake name from filename: {lake_name}")
-        
-        # Extract year from filename or text
-        year_patterns = [
-            r'(20\d{2})',  # 2000-2099
-            r'(19\d{2})',  # 1900-1999
-        ]
-        
-        # Try filename first - look for 4-digit years
-        for pattern in year_patterns:
-            matches = re.findall(pattern, filename)
-            if matches:
-                # Take the most recent year if multiple found
-                year = max(int(y) for y in matches)
-                break
-        
-        # If no 4-digit year found, try date formats like MMDDYY (071620 = July 16, 2020)
-        if not year:
-            # Pattern for MMDDYY format (6 digits)
-            date_match = re.search(r'(\d{2})(\d{2})(\d{2})', filename)
-            if date_match:
-                mm, dd, yy = date_match.groups()
-                # Convert 2-digit year to 4-digit
-                yy_int = int(yy)
-                if yy_int >= 0 and yy_int <= 30:
-                    year = 2000 + yy_int  # 00-30 -> 2000-2030
-                elif yy_int > 30 and yy_int <= 99:
-                    year = 1900 + yy_int  # 31-99 -> 1931-1999
-        
-        # If not in filename, check document text
-        if not year and text:
-            # Look for report date, monitoring year, etc.
-            date_contexts = [
-                r'Report\s+Date[:\s]+.*?(20\d{2}|19\d{2})',
-                r'Monitoring\s+Year[:\s]+.*?(20\d{2}|19\d{2})',
-                r'Data\s+from[:\s]+.*?(20\d{2}|19\d{2})',
-                r'Annual\s+Report\s+(20\d{2}|19\d{2})',
-                r'(20\d{2})',  # Fallback: any 4-digit year in text
-            ]
-            
-            for pattern in date_contexts:
-                match = re.search(pattern, text[:2000], re.IGNORECASE)
-                if match:
-                    year = int(match.group(1))
-                    break
-        
-        # Final fallback: use current year if still no year found
+        # Only the filename and the start of the text are ever searched
+        filename = doc_data.get('filename') or ''
+        lake_name, year, fallback_name = _extract_lake_name_and_year(
+            filename,
+            (doc_data.get('text') or '')[:TEXT_SEARCH_CHARS]
+        )
+        if fallback_name:
+            logger.info(f"Using fallback lake name from filename: {lake_name}")
         if not year:
             logger.warning(f"Could not extract year from {filename}, using None")
-        
         return lake_name, year
     
     def group_reports_by_lake(self, reports: List[Dict]) -> Dict[str, List[Dict]]:
@@ -418,18 +440,20 @@ class LakeAssessment:
         
         return recommendations[:4]  # Top 4 recommendations
     
-    def should_perform_assessment(self, reports: List[Dict]) -> bool:
+    def should_perform_assessment(self, reports: List[Dict], lake_groups: Optional[Dict[str, List[Dict]]] = None) -> bool:
         """
         Determine if Lake Assessment should be performed
         
         Args:
             reports: List of uploaded report analyses
+            lake_groups: group_reports_by_lake(reports), if the caller already has it
             
         Returns:
             True if assessment should be performed
         """
         # Group reports by lake
-        lake_groups = self.group_reports_by_lake(reports)
+        if lake_groups is None:
+            lake_groups = self.group_reports_by_lake(reports)
         
         # Check if any lake has enough reports for trend analysis
         for lake_name, lake_reports in lake_groups.items():
@@ -441,12 +465,13 @@ class LakeAssessment:
         
         return False
     
-    def perform_assessment(self, reports: List[Dict]) -> Dict[str, Dict]:
+    def perform_assessment(self, reports: List[Dict], lake_groups: Optional[Dict[str, List[Dict]]] = None) -> Dict[str, Dict]:
         """
         Perform Lake Assessment on multiple reports
         
         Args:
             reports: List of analyzed report data
+            lake_groups: group_reports_by_lake(reports), if the caller already has it
             
         Returns:
             Dictionary mapping lake names to assessment results
@@ -454,7 +479,8 @@ class LakeAssessment:
         assessments = {}
         
         # Group reports by lake
-        lake_groups = self.group_reports_by_lake(reports)
+        if lake_groups is None:
+            lake_groups = self.group_reports_by_lake(reports)
         
         for lake_name, lake_reports in lake_groups.items():
             # Check if we have enough reports
@@ -10,7 +10,7 @@ import json
 from pathlib import Path
 from datetime import datetime
 import logging
-from .summary_generator import summary_generator
+from .summary_generator import get_summary_generator
 
 logger = logging.getLogger(__name__)
 
@@ -103,7 +103,7 @@ class ReportGenerator:
                 summary_output = output_dir / f"{base_name}_summary.docx"
                 
                 # Generate the summary
-                summary_path = summary_generator.generate_summary(
+                summary_path = get_summary_generator().generate_summary(
                     doc_data=doc_data,
                     evaluation=compliance_eval,
                     output_path=summary_output
@@ -9,6 +9,7 @@ from docx.enum.text import WD_ALIGN_PARAGRAPH
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
+import functools
 import logging
 
 logger = logging.getLogger(__name__)
@@ -1025,6 +1026,7 @@ class SummaryReportGenerator:
                 para = doc.add_paragraph()
                 trend_run = para.add_run(trend_text)
                 trend_run.font.size = Pt(12)
+                trend_run.font.color.rgb = trend_color
                 trend_run.bold = True
             
             # Year-by-year summary table
@@ -1079,7 +1081,7 @@ class SummaryReportGenerator:
                 ]
             
             for rec in recommendations:
-                doc.add_paragraph(f'{rec}', style='List Bullet')
+                doc.add_paragraph(rec, style='List Bullet')
             
             # Save
             if output_path is None:
@@ -1093,5 +1095,8 @@ class SummaryReportGenerator:
             logger.error(f"Error generating trend summary: {e}")
             raise
 
-# Global instance
-summary_generator = SummaryReportGenerator()
+# Global instance (created on first use)
+@functools.cache
+def get_summary_generator() -> SummaryReportGenerator:
+    """Return the shared SummaryReportGenerator, building it on first call"""
+    return SummaryReportGenerator()
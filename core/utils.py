@@ -0,0 +1,39 @@
+"""
+Small helpers shared across the backend
+"""
+from collections import OrderedDict
+from typing import Any
+import os
+import time
+import uuid
+
+def uuid7() -> uuid.UUID:
+    """
+    Time-ordered UUID (version 7): 48-bit millisecond timestamp followed by
+    random bits. IDs sort by creation time, so keys and upload filenames
+    prefixed with them stay clustered instead of scattering like uuid4.
+    """
+    value = (time.time_ns() // 1_000_000) << 80
+    value |= int.from_bytes(os.urandom(10), "big")
+    value &= ~(0xF << 76) & ~(0x3 << 62)
+    value |= (0x7 << 76) | (0x2 << 62)
+    return uuid.UUID(int=value)
+
+class LRUCache(OrderedDict):
+    """Small OrderedDict-based LRU cache holding at most ``maxsize`` entries"""
+
+    def __init__(self, maxsize: int = 128):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        if key not in self:
+            return default
+        self.move_to_end(key)
+        return self[key]
+
+    def __setitem__(self, key: Any, value: Any):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
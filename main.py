@@ -1,36 +1,83 @@
 """
 FastAPI backend for Report to Reveal document analysis system
 """
-from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks, Form
+from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks, Form, Request, Response, Depends, Header, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, ORJSONResponse
+from pydantic import BaseModel, ConfigDict, ValidationError
 from typing import List, Optional
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass, asdict
+import asyncio
 import shutil
 from pathlib import Path
-import uuid
 from datetime import datetime
-import json
+import orjson
+import copy
+import functools
+import hashlib
 import logging
+import os
+import aiofiles.os
+import itertools
+import time
 
 # Import core modules
 from config import settings
 from core.document_processor import DocumentProcessor
-from core.compliance_engine import ComplianceEngine, ComplianceReport
+from core.compliance_engine import ComplianceEngine, ComplianceReport, ComplianceLevel
 from core.ai_analyzer import AIEnhancedCompliance
 from core.report_generator import ReportGenerator
 from core.email_service import initialize_email_service
 from core.lake_assessment import LakeAssessment
 from core.lake_assessment_report import LakeAssessmentReportGenerator
+from core.analysis_store import AnalysisStore
+from core.utils import LRUCache, uuid7
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Documents waiting for analysis: (analysis_id, file_path, document_type)
+processing_queue: asyncio.Queue = asyncio.Queue()
+
+async def processing_worker(worker_id: int):
+    """Pull queued documents off the processing queue and analyze them"""
+    while True:
+        analysis_id, file_path, document_type = await processing_queue.get()
+        try:
+            await process_document_with_type(analysis_id, file_path, document_type)
+        except Exception as e:
+            logger.error(f"Processing worker {worker_id} failed on {analysis_id}: {e}")
+        finally:
+            processing_queue.task_done()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the document processing workers for the lifetime of the app"""
+    workers = [
+        asyncio.create_task(processing_worker(i))
+        for i in range(max(1, settings.processing_workers))
+    ]
+    logger.info(f"Started {len(workers)} document processing worker(s)")
+    yield
+    for worker in workers:
+        worker.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+    _email_executor.shutdown(wait=True)
+    analysis_results.close()
+    if get_email_service.cache_info().currsize:
+        get_email_service().close()
+
 # Initialize FastAPI app
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
-    description="AI-powered lake management report analysis system"
+    description="AI-powered lake management report analysis system",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Add CORS middleware with support for Vercel and ngrok
@@ -49,27 +96,177 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
-# Initialize components
-document_processor = DocumentProcessor()
-compliance_engine = ComplianceEngine()
-ai_enhanced = AIEnhancedCompliance()
-report_generator = ReportGenerator()
-lake_assessment = LakeAssessment()
-lake_assessment_report = LakeAssessmentReportGenerator()
+# Components are created on first use, so workers that only serve read
+# endpoints never construct the processing pipeline or AI clients
+@functools.cache
+def get_document_processor() -> DocumentProcessor:
+    return DocumentProcessor()
+
+@functools.cache
+def get_compliance_engine() -> ComplianceEngine:
+    return ComplianceEngine()
+
+@functools.cache
+def get_ai_enhanced() -> AIEnhancedCompliance:
+    return AIEnhancedCompliance()
+
+@functools.cache
+def get_report_generator() -> ReportGenerator:
+    return ReportGenerator()
+
+@functools.cache
+def get_lake_assessment() -> LakeAssessment:
+    return LakeAssessment()
 
-# Initialize email service
-email_service = initialize_email_service(settings)
+@functools.cache
+def get_lake_assessment_report() -> LakeAssessmentReportGenerator:
+    return LakeAssessmentReportGenerator()
 
-# In-memory storage for demo (replace with database in production)
-analysis_results = {}
-# Meta-analysis storage - retain all uploaded plans as per Brief
+@functools.cache
+def get_email_service():
+    return initialize_email_service(settings)
+
+# Read/write size used when streaming uploads to disk
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+def _restore_analysis(record: dict) -> dict:
+    """Re-wrap enum values flattened when a record was spilled to disk"""
+    evaluation = record.get("evaluation")
+    if evaluation and isinstance(evaluation.get("compliance_level"), str):
+        evaluation["compliance_level"] = ComplianceLevel(evaluation["compliance_level"])
+    return record
+
+# Analysis results - most recently used records in memory, the rest on disk
+analysis_results = AnalysisStore(
+    settings.results_dir / "analyses",
+    maxsize=settings.analysis_cache_size,
+    restore=_restore_analysis
+)
+# SHA-256 of uploaded PDF bytes -> analysis_id, so re-uploads skip reprocessing
+upload_hash_index = LRUCache(maxsize=10000)
+# analysis_id -> AnalysisView for completed analyses served by /analyze
+analysis_views = LRUCache(maxsize=settings.analysis_cache_size)
+# Fire-and-forget tasks (e.g. notification emails) kept alive until they finish
+_background_jobs = set()
+# Fingerprint of evaluate_hybrid inputs -> evaluation, for re-analyzed content
+evaluation_cache = LRUCache(maxsize=512)
+
+@dataclass(slots=True)
+class RunningStats:
+    """Count, mean and variance of a stream of values (Welford's algorithm)"""
+    n: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    
+    def update(self, x: float):
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+    
+    @property
+    def variance(self) -> float:
+        return self.m2 / self.n if self.n else 0.0
+
+# Compliance scores of every analyzed report, for the meta-analysis
+meta_stats = RunningStats()
+# Meta-analysis storage - retain recent uploaded plans as per Brief
 meta_analysis_data = {
-    "total_reports_analyzed": 0,
-    "common_missing_parameters": {},
-    "common_problematic_parameters": {},
-    "average_compliance_score": 0,
-    "all_analyses": []
+    "common_missing_parameters": Counter(),
+    "common_problematic_parameters": Counter(),
+    "all_analyses": deque(maxlen=settings.meta_analysis_window)
 }
+# str(path) -> (monotonic time checked, exists) for polled report files
+_exists_cache = LRUCache(maxsize=4096)
+
+async def cached_exists(path, ttl: float = 2.0) -> bool:
+    """
+    Path.exists() for report files polled by the download page.
+    
+    Reports are only ever created, never removed, so a True result is cached
+    for good and only a False result is re-checked, at most once per ttl.
+    """
+    key = str(path)
+    cached = _exists_cache.get(key)
+    now = time.monotonic()
+    if cached is not None and (cached[1] or now - cached[0] < ttl):
+        return cached[1]
+    exists = await asyncio.to_thread(os.path.exists, key)
+    _exists_cache[key] = (now, exists)
+    return exists
+
+def _mark_exists(*paths):
+    """Record files this process just wrote so the next poll skips stat()"""
+    now = time.monotonic()
+    for path in paths:
+        if path:
+            _exists_cache[str(path)] = (now, True)
+
+# Response bodies of read-only dashboard endpoints, dropped when their data changes
+_dashboard_cache = {}
+# Lets dashboard pollers reuse a response for a couple of seconds
+DASHBOARD_CACHE_CONTROL = "private, max-age=2"
+
+# Number of analyses created by this process in each status, for /status
+status_counts = Counter()
+# submission_id / batch_id -> analysis_ids, so lookups skip scanning every record
+submission_index = defaultdict(list)
+batch_index = defaultdict(list)
+# submission_id -> Event set once every analysis in the submission has finished
+_submission_events = {}
+# submission_id -> Event set once every analysis in the submission has left the queue
+_submission_dequeued = {}
+# submission_id -> queues of connected /ws/submissions clients, fed every status change
+_submission_watchers = defaultdict(set)
+
+async def _add_analysis(analysis_id: str, record: dict):
+    """Store a new analysis record, count its status and index it"""
+    analysis_results[analysis_id] = record
+    status_counts[record["status"]] += 1
+    if record.get("submission_id"):
+        submission_index[record["submission_id"]].append(analysis_id)
+    if record.get("batch_id"):
+        batch_index[record["batch_id"]].append(analysis_id)
+    await analysis_results.persist(analysis_id)
+
+def _set_status(analysis_id: str, status: str):
+    """Move an analysis to a new status, keeping status_counts in step"""
+    record = analysis_results[analysis_id]
+    previous = record["status"]
+    status_counts[previous] -= 1
+    status_counts[status] += 1
+    record["status"] = status
+    
+    submission_id = record.get("submission_id")
+    for updates in _submission_watchers.get(submission_id, ()):
+        updates.put_nowait((analysis_id, status))
+    if previous == "queued" and submission_id in _submission_dequeued:
+        if _submission_dequeued_all(submission_id):
+            _submission_dequeued[submission_id].set()
+    if status in ("complete", "error") and submission_id in _submission_events:
+        if _submission_finished(submission_id):
+            _submission_events[submission_id].set()
+
+async def _load_analyses(analysis_ids) -> list:
+    """Records of the analysis_ids that exist, in order; misses are read off the loop"""
+    records = await asyncio.gather(*(analysis_results.load(aid) for aid in analysis_ids))
+    return [record for record in records if record is not None]
+
+def _submission_dequeued_all(submission_id: str) -> bool:
+    """True once every analysis in the submission has been picked up by a worker"""
+    return all(
+        analysis_results[aid]["status"] != "queued"
+        for aid in submission_index.get(submission_id, ())
+        if aid in analysis_results
+    )
+
+def _submission_finished(submission_id: str) -> bool:
+    """True once no analysis in the submission is still being processed"""
+    return all(
+        analysis_results[aid]["status"] in ("complete", "error")
+        for aid in submission_index.get(submission_id, ())
+        if aid in analysis_results
+    )
 
 @app.get("/")
 async def root():
@@ -86,7 +283,7 @@ async def root():
         }
     }
 
-@app.get("/health")
+@app.api_route("/health", methods=["GET", "HEAD"])
 async def health_check():
     """Health check endpoint"""
     return {
@@ -100,10 +297,58 @@ async def health_check():
         }
     }
 
+def _copy_upload(src, dst: Path, limit: int) -> str:
+    """
+    Copy an uploaded file object to dst in UPLOAD_CHUNK_SIZE chunks.
+    
+    Blocking - run it in a worker thread. Returns the SHA-256 hex digest of
+    the contents. If the upload is larger than limit, the partial file is
+    removed and a 413 is raised.
+    """
+    hasher = hashlib.sha256()
+    size = 0
+    src.seek(0)
+    with open(dst, "wb", buffering=1 << 20) as out:
+        while chunk := src.read(UPLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            if size > limit:
+                break
+            hasher.update(chunk)
+            out.write(chunk)
+    
+    if size > limit:
+        os.remove(dst)
+        raise HTTPException(
+            status_code=413, 
+            detail=f"File too large. Maximum size is {limit / 1024 / 1024}MB"
+        )
+    return hasher.hexdigest()
+
+# Allowance for multipart boundaries/headers on top of the file itself
+MULTIPART_OVERHEAD = 16 * 1024
+
+async def validate_pdf_upload(
+    file: UploadFile = File(...),
+    content_length: Optional[int] = Header(None)
+) -> UploadFile:
+    """
+    Dependency for single-PDF upload endpoints.
+    
+    Rejects requests whose declared Content-Length already exceeds the upload
+    limit, and files that aren't PDFs, before anything is copied or hashed.
+    """
+    if content_length is not None and content_length > settings.max_upload_size + MULTIPART_OVERHEAD:
+        raise HTTPException(
+            status_code=413, 
+            detail=f"File too large. Maximum size is {settings.max_upload_size / 1024 / 1024}MB"
+        )
+    if not file.filename or not file.filename.lower().endswith('.pdf'):
+        raise HTTPException(status_code=400, detail="Only PDF files are accepted")
+    return file
+
 @app.post(f"{settings.api_prefix}/upload-single")  # Changed path to avoid conflict
 async def upload_single_document(
-    background_tasks: BackgroundTasks,
-    file: UploadFile = File(...),
+    file: UploadFile = Depends(validate_pdf_upload),
     use_ocr: bool = False,
     email: Optional[str] = None
 ):
@@ -112,31 +357,29 @@ async def upload_single_document(
     
     Returns analysis_id for tracking
     """
-    # Validate file type
-    if not file.filename.lower().endswith('.pdf'):
-        raise HTTPException(status_code=400, detail="Only PDF files are accepted")
-    
-    # Check file size
-    file_size = 0
-    contents = await file.read()
-    file_size = len(contents)
-    
-    if file_size > settings.max_upload_size:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"File too large. Maximum size is {settings.max_upload_size / 1024 / 1024}MB"
-        )
-    
     # Generate unique ID for this analysis
-    analysis_id = str(uuid.uuid4())
+    analysis_id = str(uuid7())
     
-    # Save uploaded file
+    # Stream uploaded file to disk, checking size as we go so the whole
+    # PDF is never held in memory
     upload_path = settings.upload_dir / f"{analysis_id}_{file.filename}"
-    with open(upload_path, "wb") as f:
-        f.write(contents)
+    digest = await asyncio.to_thread(_copy_upload, file.file, upload_path, settings.max_upload_size)
+    
+    # Identical PDF already analyzed (or in progress) - reuse that analysis
+    previous_id = upload_hash_index.get(digest)
+    previous = await analysis_results.load(previous_id) if previous_id else None
+    if previous is not None:
+        if previous["status"] != "error":
+            await aiofiles.os.remove(upload_path)
+            return {
+                "analysis_id": previous_id,
+                "filename": file.filename,
+                "status": previous["status"],
+                "message": "Identical document was already uploaded. Returning existing analysis."
+            }
     
     # Store initial result
-    analysis_results[analysis_id] = {
+    await _add_analysis(analysis_id, {
         "id": analysis_id,
         "filename": file.filename,
         "upload_time": datetime.now().isoformat(),
@@ -144,15 +387,11 @@ async def upload_single_document(
         "status": "processing",
         "file_path": str(upload_path),
         "document_type": "report"  # Default to report for legacy uploads
-    }
+    })
+    upload_hash_index[digest] = analysis_id
     
-    # Process in background - default to report type
-    background_tasks.add_task(
-        process_document_with_type,
-        analysis_id,
-        str(upload_path),
-        "report"
-    )
+    # Queue for processing - default to report type
+    processing_queue.put_nowait((analysis_id, str(upload_path), "report"))
     
     return {
         "analysis_id": analysis_id,
@@ -161,34 +400,65 @@ async def upload_single_document(
         "message": "Document uploaded successfully. Processing in background."
     }
 
+def _record_meta_analysis(analysis_id: str, evaluation: dict, document_type: Optional[str] = None):
+    """
+    Add a completed analysis to the meta-analysis statistics.
+    
+    All updates happen in one step with no await in between, so concurrent
+    pipelines on the event loop never see a half-applied update.
+    """
+    # Keep just the parameter names; the full entries live on the analysis record
+    missing = [
+        param.get("name", param) if isinstance(param, dict) else param
+        for param in evaluation["critical_parameters"]["missing"]
+    ]
+    problematic = evaluation["problematic_parameters"]["found"]
+    
+    meta_analysis_data["all_analyses"].append({
+        "analysis_id": analysis_id,
+        "filename": analysis_results[analysis_id]["filename"],
+        "document_type": document_type,
+        "date": datetime.now().isoformat(),
+        "score": evaluation["compliance_percentage"],
+        "missing_parameters": missing,
+        "problematic_parameters": problematic
+    })
+    
+    # Update meta-analysis statistics
+    meta_stats.update(evaluation["compliance_percentage"])
+    meta_analysis_data["common_missing_parameters"].update(missing)
+    meta_analysis_data["common_problematic_parameters"].update(problematic)
+    _dashboard_cache.pop("meta-analysis", None)
+
 async def process_document_background(analysis_id: str, file_path: str, use_ocr: bool):
     """Background task to process document"""
     try:
         logger.info(f"Starting background processing for {analysis_id}")
         
-        # Update status
-        analysis_results[analysis_id]["status"] = "extracting"
+        # Update status (bringing the record back into memory if it was spilled)
+        await analysis_results.load(analysis_id)
+        _set_status(analysis_id, "extracting")
         
         # Step 1: Process document
-        doc_data = await document_processor.process_document(file_path, use_ocr)
+        doc_data = await get_document_processor().process_document(file_path, use_ocr)
         analysis_results[analysis_id]["extraction_complete"] = True
         
         # Step 2: Compliance evaluation
-        analysis_results[analysis_id]["status"] = "evaluating"
-        compliance_eval = compliance_engine.evaluate_document(doc_data)
+        _set_status(analysis_id, "evaluating")
+        compliance_eval = get_compliance_engine().evaluate_document(doc_data)
         
         # Step 3: AI analysis (if configured and not skipped)
         if settings.openai_api_key and not settings.skip_ai_analysis:
-            analysis_results[analysis_id]["status"] = "ai_analysis"
-            enhanced_eval = await ai_enhanced.enhanced_evaluation(doc_data, compliance_eval)
+            _set_status(analysis_id, "ai_analysis")
+            enhanced_eval = await get_ai_enhanced().enhanced_evaluation(doc_data, compliance_eval)
         else:
             enhanced_eval = compliance_eval
             if settings.skip_ai_analysis:
                 logger.info(f"AI analysis skipped for {analysis_id} (skip_ai_analysis=True)")
         
         # Step 4: Generate report
-        analysis_results[analysis_id]["status"] = "generating_report"
-        report_path, summary_path = await report_generator.generate_report(
+        _set_status(analysis_id, "generating_report")
+        report_path, summary_path = await get_report_generator().generate_report(
             doc_data,
             enhanced_eval,
             enhanced_eval.get("ai_insights"),
@@ -197,41 +467,178 @@ async def process_document_background(analysis_id: str, file_path: str, use_ocr:
         )
         
         # Update final results
+        _set_status(analysis_id, "complete")
         analysis_results[analysis_id].update({
-            "status": "complete",
             "completion_time": datetime.now().isoformat(),
             "compliance_score": enhanced_eval["compliance_percentage"],
             "compliance_level": enhanced_eval["compliance_level"].value,
             "document_data": doc_data,
             "evaluation": enhanced_eval,
             "report_path": report_path,
-            "summary_path": summary_path
+            "summary_path": summary_path,
+            # Computed once here rather than on every /analyze poll
+            "summary": ComplianceReport.generate_summary(enhanced_eval),
+            "top_recommendations": enhanced_eval["recommendations"][:5]
         })
+        await analysis_results.persist(analysis_id)
+        analysis_views[analysis_id] = _build_analysis_view(analysis_results[analysis_id])
+        _mark_exists(report_path, summary_path)
         
         # Store for meta-analysis as per Brief requirement
-        meta_analysis_data["all_analyses"].append({
-            "analysis_id": analysis_id,
-            "filename": analysis_results[analysis_id]["filename"],
-            "date": datetime.now().isoformat(),
-            "score": enhanced_eval["compliance_percentage"],
-            "missing_parameters": enhanced_eval["critical_parameters"]["missing"],
-            "problematic_parameters": enhanced_eval["problematic_parameters"]["found"]
-        })
-        
-        # Update meta-analysis statistics
-        meta_analysis_data["total_reports_analyzed"] += 1
-        all_scores = [a["score"] for a in meta_analysis_data["all_analyses"]]
-        meta_analysis_data["average_compliance_score"] = sum(all_scores) / len(all_scores)
+        _record_meta_analysis(analysis_id, enhanced_eval)
         
         logger.info(f"Processing complete for {analysis_id}")
         
     except Exception as e:
         logger.error(f"Error processing document {analysis_id}: {e}")
+        _set_status(analysis_id, "error")
         analysis_results[analysis_id].update({
-            "status": "error",
             "error": str(e),
             "error_time": datetime.now().isoformat()
         })
+        await analysis_results.persist(analysis_id)
+
+def _evaluation_cache_key(doc_data: dict) -> str:
+    """Fingerprint the content evaluate_hybrid depends on (not per-upload paths)"""
+    content = {k: v for k, v in doc_data.items() if k not in ("file_path", "filename")}
+    payload = orjson.dumps(
+        content,
+        default=str,
+        option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+    )
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+async def _detect_document_type(analysis_id: str, doc_data: dict) -> Optional[dict]:
+    """AI-powered document type detection (None if AI is not available)"""
+    if not (settings.openai_api_key and settings.openai_api_key != "your_openai_api_key_here" and not settings.skip_ai_analysis):
+        return None
+    try:
+        ai_analyzer = get_ai_enhanced().ai_analyzer
+        context = ai_analyzer._prepare_context(doc_data)
+        detected_type = await ai_analyzer._detect_document_type(context)
+        logger.info(f"AI detected document type: {detected_type.get('primary_type', 'hybrid')} "
+                   f"(Plan: {detected_type.get('plan_percentage', 50)}%, "
+                   f"Report: {detected_type.get('report_percentage', 50)}%)")
+        return detected_type
+    except Exception as e:
+        logger.warning(f"Document type detection failed for {analysis_id}, using hybrid: {e}")
+        return {"primary_type": "hybrid", "plan_percentage": 50, "report_percentage": 50}
+
+async def _evaluate_hybrid(analysis_id: str, doc_data: dict) -> dict:
+    """
+    Hybrid compliance evaluation, run in a worker thread.
+    
+    The engine is deterministic, so identical content reuses a cached
+    evaluation. The AI-detected type is attached by the caller afterwards.
+    """
+    eval_key = _evaluation_cache_key(doc_data)
+    cached_eval = evaluation_cache.get(eval_key)
+    if cached_eval is not None:
+        logger.info(f"Reusing cached compliance evaluation for {analysis_id}")
+        return copy.deepcopy(cached_eval)
+    
+    compliance_eval = await asyncio.to_thread(get_compliance_engine().evaluate_hybrid, doc_data, None)
+    evaluation_cache[eval_key] = copy.deepcopy(compliance_eval)
+    return compliance_eval
+
+def spawn_background(coro):
+    """Run a coroutine as a fire-and-forget task, keeping it referenced until done"""
+    task = asyncio.create_task(coro)
+    _background_jobs.add(task)
+    task.add_done_callback(_background_jobs.discard)
+    return task
+
+# Blocking SMTP sends get their own threads, one per pooled SMTP session, so
+# a slow mail server never ties up the default executor used for file I/O
+_email_executor = ThreadPoolExecutor(
+    max_workers=max(1, settings.email_workers),
+    thread_name_prefix="email"
+)
+
+async def _send_email(send, **kwargs) -> bool:
+    """Run a blocking EmailService send on the email executor"""
+    try:
+        return await asyncio.get_running_loop().run_in_executor(
+            _email_executor, functools.partial(send, **kwargs)
+        )
+    except Exception as e:
+        logger.error(f"Failed to send email via {send.__name__}: {e}")
+        return False
+
+async def _send_lake_assessment_emails(contact_info: dict, assessment_paths: dict, assessment_results: dict):
+    """Send one Lake Assessment email per lake, concurrently"""
+    await asyncio.gather(*(
+        _send_email(
+            get_email_service().send_lake_assessment_notification,
+            customer_name=contact_info.get("name", "Unknown"),
+            customer_email=contact_info.get("email", "Unknown"),
+            lake_name=lake_name,
+            report_path=report_path,
+            year_range=assessment_results[lake_name].get("year_range", "Unknown")
+        )
+        for lake_name, report_path in assessment_paths.items()
+    ))
+
+async def _send_customer_report(
+    analysis_id: str,
+    report_path: Path,
+    compliance_score: float,
+    document_type: str
+) -> bool:
+    """Email a report to the analysis' contact and record whether it was sent"""
+    result = await analysis_results.load(analysis_id)
+    contact_info = result.get("contact_info", {})
+    email_sent = await _send_email(
+        get_email_service().send_report_to_customer,
+        to_email=contact_info["email"],
+        customer_name=contact_info.get("name", "Customer"),
+        report_path=report_path,
+        document_name=result["filename"],
+        compliance_score=compliance_score,
+        document_type=document_type
+    )
+    
+    result = await analysis_results.load(analysis_id)
+    if email_sent:
+        logger.info(f"Report sent to {contact_info['email']}")
+        result["email_sent"] = True
+        result["email_sent_time"] = datetime.now().isoformat()
+    else:
+        logger.warning(f"Failed to send report to {contact_info['email']}")
+        result["email_sent"] = False
+    await analysis_results.persist(analysis_id)
+    return email_sent
+
+async def _send_completion_emails(
+    analysis_id: str,
+    report_path: str,
+    summary_path: Optional[str],
+    compliance_score: float,
+    document_type: str
+):
+    """Send the customer report (if automatic sending is on) and the admin notice"""
+    try:
+        result = await analysis_results.load(analysis_id)
+        # Get contact info from analysis results
+        contact_info = result.get("contact_info", {})
+        
+        # Send report to customer if automatic sending is enabled
+        if settings.send_reports_automatically and contact_info.get("email"):
+            # Send the summary report to customers (detailed report kept internal)
+            report_to_send = Path(summary_path) if summary_path else Path(report_path)
+            await _send_customer_report(analysis_id, report_to_send, compliance_score, document_type)
+            result = await analysis_results.load(analysis_id)
+        
+        # Always send admin notification when processing is complete
+        await _send_email(
+            get_email_service().send_processing_complete_notification,
+            submission_id=result.get("submission_id", analysis_id),
+            document_name=result["filename"],
+            compliance_score=compliance_score,
+            report_path=Path(report_path)
+        )
+    except Exception as e:
+        logger.error(f"Failed to send notifications for {analysis_id}: {e}")
 
 async def process_document_with_type(analysis_id: str, file_path: str, document_type: str = None):
     """
@@ -244,33 +651,23 @@ async def process_document_with_type(analysis_id: str, file_path: str, document_
     try:
         logger.info(f"Starting hybrid processing for {analysis_id}")
         
-        # Update status
-        analysis_results[analysis_id]["status"] = "extracting"
+        # Update status (bringing the record back into memory if it was spilled)
+        await analysis_results.load(analysis_id)
+        _set_status(analysis_id, "extracting")
         
         # Step 1: Process document
-        doc_data = await document_processor.process_document(file_path, False)
+        doc_data = await get_document_processor().process_document(file_path, False)
         analysis_results[analysis_id]["extraction_complete"] = True
         
-        # Step 2: AI-powered document type detection (if AI available)
-        detected_type = None
-        if settings.openai_api_key and settings.openai_api_key != "your_openai_api_key_here" and not settings.skip_ai_analysis:
-            analysis_results[analysis_id]["status"] = "detecting_type"
-            try:
-                ai_analyzer = ai_enhanced.ai_analyzer
-                context = ai_analyzer._prepare_context(doc_data)
-                detected_type = await ai_analyzer._detect_document_type(context)
-                logger.info(f"AI detected document type: {detected_type.get('primary_type', 'hybrid')} "
-                           f"(Plan: {detected_type.get('plan_percentage', 50)}%, "
-                           f"Report: {detected_type.get('report_percentage', 50)}%)")
-            except Exception as e:
-                logger.warning(f"Document type detection failed, using hybrid: {e}")
-                detected_type = {"primary_type": "hybrid", "plan_percentage": 50, "report_percentage": 50}
-        
+        # Step 2: AI-powered document type detection (if AI available) and
         # Step 3: Hybrid Compliance evaluation (analyzes as both plan AND report)
-        analysis_results[analysis_id]["status"] = "evaluating"
-        
-        # Always use hybrid evaluation to analyze both aspects
-        compliance_eval = compliance_engine.evaluate_hybrid(doc_data, detected_type)
+        # Both only need doc_data, so the AI round trip overlaps the evaluation
+        _set_status(analysis_id, "evaluating")
+        detected_type, compliance_eval = await asyncio.gather(
+            _detect_document_type(analysis_id, doc_data),
+            _evaluate_hybrid(analysis_id, doc_data)
+        )
+        compliance_eval['hybrid_analysis']['ai_detected_type'] = detected_type
         compliance_eval['evaluation_type'] = 'Hybrid Analysis (Plan + Report)'
         compliance_eval['detected_document_type'] = detected_type
         
@@ -314,16 +711,16 @@ async def process_document_with_type(analysis_id: str, file_path: str, document_
         
         # Step 4: Enhanced AI analysis (if configured and not skipped)
         if settings.openai_api_key and settings.openai_api_key != "your_openai_api_key_here" and not settings.skip_ai_analysis:
-            analysis_results[analysis_id]["status"] = "ai_analysis"
-            enhanced_eval = await ai_enhanced.enhanced_evaluation(doc_data, compliance_eval)
+            _set_status(analysis_id, "ai_analysis")
+            enhanced_eval = await get_ai_enhanced().enhanced_evaluation(doc_data, compliance_eval)
         else:
             enhanced_eval = compliance_eval
             if settings.skip_ai_analysis:
                 logger.info(f"AI analysis skipped for {analysis_id} (skip_ai_analysis=True)")
         
         # Step 4: Generate report
-        analysis_results[analysis_id]["status"] = "generating_report"
-        report_path, summary_path = await report_generator.generate_report(
+        _set_status(analysis_id, "generating_report")
+        report_path, summary_path = await get_report_generator().generate_report(
             doc_data,
             enhanced_eval,
             enhanced_eval.get("ai_insights"),
@@ -332,8 +729,8 @@ async def process_document_with_type(analysis_id: str, file_path: str, document_
         )
         
         # Update final results
+        _set_status(analysis_id, "complete")
         analysis_results[analysis_id].update({
-            "status": "complete",
             "completion_time": datetime.now().isoformat(),
             "document_type": document_type,
             "compliance_score": enhanced_eval["compliance_percentage"],
@@ -341,80 +738,209 @@ async def process_document_with_type(analysis_id: str, file_path: str, document_
             "document_data": doc_data,
             "evaluation": enhanced_eval,
             "report_path": report_path,
-            "summary_path": summary_path
+            "summary_path": summary_path,
+            # Computed once here rather than on every /analyze poll
+            "summary": ComplianceReport.generate_summary(enhanced_eval),
+            "top_recommendations": enhanced_eval["recommendations"][:5]
         })
+        await analysis_results.persist(analysis_id)
+        analysis_views[analysis_id] = _build_analysis_view(analysis_results[analysis_id])
+        _mark_exists(report_path, summary_path)
         
         # Store for meta-analysis
-        meta_analysis_data["all_analyses"].append({
-            "analysis_id": analysis_id,
-            "filename": analysis_results[analysis_id]["filename"],
-            "document_type": document_type,
-            "date": datetime.now().isoformat(),
-            "score": enhanced_eval["compliance_percentage"],
-            "missing_parameters": enhanced_eval["critical_parameters"]["missing"],
-            "problematic_parameters": enhanced_eval["problematic_parameters"]["found"]
-        })
-        
-        # Update meta-analysis statistics
-        meta_analysis_data["total_reports_analyzed"] += 1
-        all_scores = [a["score"] for a in meta_analysis_data["all_analyses"]]
-        meta_analysis_data["average_compliance_score"] = sum(all_scores) / len(all_scores)
+        _record_meta_analysis(analysis_id, enhanced_eval, document_type)
         
         logger.info(f"Processing complete for {analysis_id} ({document_type})")
         
-        # Send email notifications if configured
-        if email_service.is_configured():
-            # Get contact info from analysis results
-            contact_info = analysis_results[analysis_id].get("contact_info", {})
-            
-            # Send report to customer if automatic sending is enabled
-            if settings.send_reports_automatically and contact_info.get("email"):
-                # Send the summary report to customers (detailed report kept internal)
-                report_to_send = Path(summary_path) if summary_path else Path(report_path)
-                email_sent = email_service.send_report_to_customer(
-                    to_email=contact_info["email"],
-                    customer_name=contact_info.get("name", "Customer"),
-                    report_path=report_to_send,
-                    document_name=analysis_results[analysis_id]["filename"],
-                    compliance_score=enhanced_eval["compliance_percentage"],
-                    document_type=document_type
-                )
-                
-                if email_sent:
-                    logger.info(f"Report sent to {contact_info['email']}")
-                    analysis_results[analysis_id]["email_sent"] = True
-                    analysis_results[analysis_id]["email_sent_time"] = datetime.now().isoformat()
-                else:
-                    logger.warning(f"Failed to send report to {contact_info['email']}")
-                    analysis_results[analysis_id]["email_sent"] = False
-            
-            # Always send admin notification when processing is complete
-            email_service.send_processing_complete_notification(
-                submission_id=analysis_results[analysis_id].get("submission_id", analysis_id),
-                document_name=analysis_results[analysis_id]["filename"],
-                compliance_score=enhanced_eval["compliance_percentage"],
-                report_path=Path(report_path)
-            )
+        # Send email notifications in the background - the analysis is
+        # already reported as complete while the SMTP exchange runs
+        if get_email_service().is_configured():
+            spawn_background(_send_completion_emails(
+                analysis_id,
+                report_path,
+                summary_path,
+                enhanced_eval["compliance_percentage"],
+                document_type
+            ))
         else:
             logger.info("Email service not configured. Skipping email notifications.")
         
     except Exception as e:
         logger.error(f"Error processing document {analysis_id}: {e}")
+        _set_status(analysis_id, "error")
         analysis_results[analysis_id].update({
-            "status": "error",
             "error": str(e),
             "error_time": datetime.now().isoformat()
         })
+        await analysis_results.persist(analysis_id)
+
+@dataclass(slots=True)
+class AnalysisView:
+    """Slim /analyze response for a completed analysis, built once per analysis"""
+    id: str
+    filename: str
+    status: str
+    upload_time: str
+    completion_time: str
+    compliance_score: float
+    compliance_level: str
+    summary: str
+    recommendations: list
+    report_available: bool = True
+
+def _build_analysis_view(result: dict) -> AnalysisView:
+    """Build the /analyze view of a completed analysis record"""
+    # Records completed before summaries were precomputed
+    summary = result.get("summary")
+    if summary is None:
+        summary = ComplianceReport.generate_summary(result["evaluation"])
+    recommendations = result.get("top_recommendations")
+    if recommendations is None:
+        recommendations = result["evaluation"]["recommendations"][:5]  # Top 5
+    
+    return AnalysisView(
+        id=result["id"],
+        filename=result["filename"],
+        status=result["status"],
+        upload_time=result["upload_time"],
+        completion_time=result["completion_time"],
+        compliance_score=result["compliance_score"],
+        compliance_level=result["compliance_level"],
+        summary=summary,
+        recommendations=recommendations
+    )
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """True if the client's If-None-Match header already names this ETag"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    return etag in (tag.strip() for tag in if_none_match.split(","))
+
+DOCX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+async def _download_response(request: Request, path, filename: str) -> Response:
+    """
+    Serve a generated report, or a 304 if the client already has this version.
+    
+    The file is stat()ed once; FileResponse reuses that result instead of
+    stat()ing again before streaming the body.
+    """
+    try:
+        stat = await asyncio.to_thread(os.stat, path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Report file not found")
+    
+    validator = f"{path}:{stat.st_mtime_ns}:{stat.st_size}"
+    etag = f'"{hashlib.blake2b(validator.encode(), digest_size=8).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=3600"}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    
+    return FileResponse(
+        path=path,
+        filename=filename,
+        media_type=DOCX_MEDIA_TYPE,
+        headers=headers,
+        stat_result=stat
+    )
+
+MAX_BULK_STATUS_IDS = 100
+
+@app.get(f"{settings.api_prefix}/analyze")
+async def get_analysis_statuses(ids: str, request: Request):
+    """
+    Statuses of several analyses in one call: ?ids=a,b,c -> {id: status}.
+    Unknown IDs map to null.
+    """
+    analysis_ids = [aid for aid in ids.split(",") if aid]
+    if len(analysis_ids) > MAX_BULK_STATUS_IDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_BULK_STATUS_IDS} analysis IDs per request"
+        )
+    
+    results = await asyncio.gather(*(analysis_results.load(aid) for aid in analysis_ids))
+    statuses = {
+        aid: result["status"] if result is not None else None
+        for aid, result in zip(analysis_ids, results)
+    }
+    
+    # Pollers get a bodyless 304 until one of the statuses changes
+    body = orjson.dumps(statuses)
+    etag = '"' + hashlib.md5(body).hexdigest() + '"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+@app.websocket(f"{settings.api_prefix}/ws/submissions/{{submission_id}}")
+async def submission_updates(websocket: WebSocket, submission_id: str):
+    """
+    Push a submission's analysis statuses as they change, instead of making
+    clients poll /analyze. Each message is {"statuses": {id: status},
+    "finished": bool}; the socket is closed once every analysis has finished.
+    """
+    if submission_id not in submission_index:
+        await websocket.close(code=1008)
+        return
+    
+    await websocket.accept()
+    updates = asyncio.Queue()
+    _submission_watchers[submission_id].add(updates)
+    try:
+        statuses = {
+            result["id"]: result["status"]
+            for result in await _load_analyses(submission_index[submission_id])
+        }
+        while True:
+            finished = all(s in ("complete", "error") for s in statuses.values())
+            await websocket.send_text(orjson.dumps({"statuses": statuses, "finished": finished}).decode())
+            if finished:
+                break
+            # Wait for the next change, then fold in any that queued up behind it
+            analysis_id, status = await updates.get()
+            statuses[analysis_id] = status
+            while not updates.empty():
+                analysis_id, status = updates.get_nowait()
+                statuses[analysis_id] = status
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        watchers = _submission_watchers.get(submission_id)
+        if watchers is not None:
+            watchers.discard(updates)
+            if not watchers:
+                del _submission_watchers[submission_id]
 
 @app.get(f"{settings.api_prefix}/analyze/{{analysis_id}}")
-async def get_analysis(analysis_id: str):
+async def get_analysis(analysis_id: str, request: Request):
     """Get analysis results by ID"""
-    if analysis_id not in analysis_results:
+    result = await analysis_results.load(analysis_id)
+    if result is None:
         raise HTTPException(status_code=404, detail="Analysis not found")
     
-    result = analysis_results[analysis_id]
-    
     # Don't send full document data in response (too large)
+    if result["status"] == "complete":
+        # Completed analyses never change, so let clients cache them
+        etag = '"' + hashlib.md5(f"{analysis_id}:{result['completion_time']}".encode()).hexdigest() + '"'
+        headers = {"ETag": etag, "Cache-Control": "private, max-age=3600, immutable"}
+        if _etag_matches(request, etag):
+            return Response(status_code=304, headers=headers)
+        
+        view = analysis_views.get(analysis_id)
+        if view is None:
+            view = analysis_views[analysis_id] = _build_analysis_view(result)
+        return ORJSONResponse(asdict(view), headers=headers)
+    
+    # Still changing - polls must revalidate, but get a bodyless 304
+    # until the status moves on
+    etag = '"' + hashlib.md5(f"{analysis_id}:{result['status']}".encode()).hexdigest() + '"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    
     response = {
         "id": result["id"],
         "filename": result["filename"],
@@ -422,46 +948,31 @@ async def get_analysis(analysis_id: str):
         "upload_time": result["upload_time"]
     }
     
-    if result["status"] == "complete":
-        response.update({
-            "completion_time": result["completion_time"],
-            "compliance_score": result["compliance_score"],
-            "compliance_level": result["compliance_level"],
-            "summary": ComplianceReport.generate_summary(result["evaluation"]),
-            "recommendations": result["evaluation"]["recommendations"][:5],  # Top 5
-            "report_available": True
-        })
-    elif result["status"] == "error":
+    if result["status"] == "error":
         response.update({
             "error": result["error"],
             "error_time": result["error_time"]
         })
     
-    return response
+    return ORJSONResponse(response, headers=headers)
 
 @app.get(f"{settings.api_prefix}/report/{{analysis_id}}")
-async def download_report(analysis_id: str):
+async def download_report(analysis_id: str, request: Request):
     """Download generated Word report"""
-    if analysis_id not in analysis_results:
+    result = await analysis_results.load(analysis_id)
+    if result is None:
         raise HTTPException(status_code=404, detail="Analysis not found")
     
-    result = analysis_results[analysis_id]
-    
     if result["status"] != "complete":
         raise HTTPException(
             status_code=400, 
             detail=f"Report not ready. Current status: {result['status']}"
         )
     
-    report_path = Path(result["report_path"])
-    
-    if not report_path.exists():
-        raise HTTPException(status_code=404, detail="Report file not found")
-    
-    return FileResponse(
-        path=report_path,
-        filename=f"analysis_{result['filename'].replace('.pdf', '')}.docx",
-        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+    return await _download_response(
+        request,
+        result["report_path"],
+        f"analysis_{result['filename'].replace('.pdf', '')}.docx"
     )
 
 # ============================================
@@ -473,20 +984,19 @@ async def get_analysis_status(analysis_id: str):
     """
     Get status of a specific analysis (public endpoint for download page)
     """
-    if analysis_id not in analysis_results:
+    result = await analysis_results.load(analysis_id)
+    if result is None:
         raise HTTPException(status_code=404, detail="Analysis not found")
     
-    result = analysis_results[analysis_id]
-    
     # Check if report files are ready
     report_ready = False
     summary_ready = False
     
     if result.get("report_path"):
-        report_ready = Path(result["report_path"]).exists()
+        report_ready = await cached_exists(result["report_path"])
     
     if result.get("summary_path"):
-        summary_ready = Path(result["summary_path"]).exists()
+        summary_ready = await cached_exists(result["summary_path"])
     
     return {
         "analysis_id": analysis_id,
@@ -499,7 +1009,7 @@ async def get_analysis_status(analysis_id: str):
     }
 
 @app.get(f"{settings.api_prefix}/download/{{analysis_id}}/{{report_type}}")
-async def download_public_report(analysis_id: str, report_type: str):
+async def download_public_report(analysis_id: str, report_type: str, request: Request):
     """
     Download report files (public endpoint)
     
@@ -507,11 +1017,10 @@ async def download_public_report(analysis_id: str, report_type: str):
         analysis_id: The analysis ID
         report_type: Either 'report' for full report or 'summary' for summary report
     """
-    if analysis_id not in analysis_results:
+    result = await analysis_results.load(analysis_id)
+    if result is None:
         raise HTTPException(status_code=404, detail="Analysis not found")
     
-    result = analysis_results[analysis_id]
-    
     if result["status"] != "complete":
         raise HTTPException(
             status_code=400, 
@@ -532,36 +1041,23 @@ async def download_public_report(analysis_id: str, report_type: str):
     else:
         raise HTTPException(status_code=400, detail="Invalid report type. Use 'report' or 'summary'")
     
-    file_path = Path(file_path)
-    
-    if not file_path.exists():
-        raise HTTPException(status_code=404, detail="Report file not found")
-    
     # Create a user-friendly filename
     original_filename = result.get("filename", "document").replace('.pdf', '')
     download_filename = f"{original_filename}{filename_suffix}.docx"
     
-    return FileResponse(
-        path=file_path,
-        filename=download_filename,
-        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-    )
+    return await _download_response(request, file_path, download_filename)
 
 @app.get(f"{settings.api_prefix}/status")
-async def get_system_status():
+async def get_system_status(response: Response):
     """Get overall system status and statistics"""
-    total_analyses = len(analysis_results)
-    complete = sum(1 for r in analysis_results.values() if r["status"] == "complete")
-    processing = sum(1 for r in analysis_results.values() if r["status"] == "processing")
-    errors = sum(1 for r in analysis_results.values() if r["status"] == "error")
-    
+    response.headers["Cache-Control"] = DASHBOARD_CACHE_CONTROL
     return {
         "system_status": "operational",
         "statistics": {
-            "total_analyses": total_analyses,
-            "complete": complete,
-            "processing": processing,
-            "errors": errors
+            "total_analyses": status_counts.total(),
+            "complete": status_counts["complete"],
+            "processing": status_counts["processing"],
+            "errors": status_counts["error"]
         },
         "ai_enabled": bool(settings.openai_api_key),
         "compliance_rules_version": "1.0",
@@ -569,17 +1065,16 @@ async def get_system_status():
     }
 
 @app.post(f"{settings.api_prefix}/send-report/{{analysis_id}}")
-async def send_report_email(analysis_id: str):
+async def send_report_email(analysis_id: str, background_tasks: BackgroundTasks):
     """Manually send report to customer email"""
-    if analysis_id not in analysis_results:
+    result = await analysis_results.load(analysis_id)
+    if result is None:
         raise HTTPException(status_code=404, detail="Analysis not found")
     
-    result = analysis_results[analysis_id]
-    
     if result["status"] != "complete":
         raise HTTPException(status_code=400, detail="Analysis not complete")
     
-    if not email_service.is_configured():
+    if not get_email_service().is_configured():
         raise HTTPException(status_code=503, detail="Email service not configured")
     
     contact_info = result.get("contact_info", {})
@@ -587,28 +1082,23 @@ async def send_report_email(analysis_id: str):
         raise HTTPException(status_code=400, detail="No email address available")
     
     # Send the summary report to customers (detailed report kept internal)
-    report_to_send = Path(result.get("summary_path", result["report_path"]))
-    email_sent = email_service.send_report_to_customer(
-        to_email=contact_info["email"],
-        customer_name=contact_info.get("name", "Customer"),
-        report_path=report_to_send,
-        document_name=result["filename"],
-        compliance_score=result["evaluation"]["compliance_percentage"],
-        document_type=result.get("document_type", "report")
+    report_to_send = Path(result.get("summary_path") or result["report_path"])
+    # Sent after the response; the outcome is recorded as email_sent
+    background_tasks.add_task(
+        _send_customer_report,
+        analysis_id,
+        report_to_send,
+        result["evaluation"]["compliance_percentage"],
+        result.get("document_type", "report")
     )
-    
-    if email_sent:
-        analysis_results[analysis_id]["email_sent"] = True
-        analysis_results[analysis_id]["email_sent_time"] = datetime.now().isoformat()
-        return {"success": True, "message": f"Report sent to {contact_info['email']}"}
-    else:
-        raise HTTPException(status_code=500, detail="Failed to send email")
+    return {"success": True, "message": f"Sending report to {contact_info['email']}"}
 
 @app.get(f"{settings.api_prefix}/email-status")
-async def check_email_configuration():
+async def check_email_configuration(response: Response):
     """Check if email service is configured"""
+    response.headers["Cache-Control"] = DASHBOARD_CACHE_CONTROL
     return {
-        "configured": email_service.is_configured(),
+        "configured": get_email_service().is_configured(),
         "smtp_host": settings.smtp_host if settings.smtp_host else "Not configured",
         "automatic_sending": settings.send_reports_automatically,
         "admin_email": settings.admin_email if settings.admin_email else "Not configured"
@@ -623,16 +1113,15 @@ async def generate_trend_analysis(
     Generate trend analysis for multiple years of reports
     This creates a Lake Assessment showing trends over time
     """
-    from core.summary_generator import summary_generator
+    from core.summary_generator import get_summary_generator
     
     # Collect data for trend analysis
     multi_year_data = []
     
     if analysis_ids:
         # Use specific analysis IDs
-        for aid in analysis_ids:
-            if aid in analysis_results and analysis_results[aid]["status"] == "complete":
-                result = analysis_results[aid]
+        for result in await _load_analyses(analysis_ids):
+            if result["status"] == "complete":
                 multi_year_data.append({
                     "year": result.get("upload_time", "Unknown")[:4],  # Extract year
                     "compliance_percentage": result.get("compliance_score", 0),
@@ -641,8 +1130,8 @@ async def generate_trend_analysis(
                 })
     else:
         # Use all analyses for a submission
-        for aid, result in analysis_results.items():
-            if result.get("submission_id") == submission_id and result["status"] == "complete":
+        for result in await _load_analyses(submission_index.get(submission_id, ())):
+            if result["status"] == "complete":
                 multi_year_data.append({
                     "year": result.get("upload_time", "Unknown")[:4],
                     "compliance_percentage": result.get("compliance_score", 0),
@@ -661,7 +1150,7 @@ async def generate_trend_analysis(
     
     # Generate trend summary
     try:
-        trend_report_path = summary_generator.generate_trend_summary(
+        trend_report_path = get_summary_generator().generate_trend_summary(
             multi_year_data=multi_year_data,
             output_path=settings.results_dir / f"trend_analysis_{submission_id}.docx"
         )
@@ -677,43 +1166,64 @@ async def generate_trend_analysis(
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get(f"{settings.api_prefix}/meta-analysis")
-async def get_meta_analysis():
+async def get_meta_analysis(response: Response):
     """Get meta-analysis of all uploaded Lake Management Plans (as per Brief requirement)"""
+    response.headers["Cache-Control"] = DASHBOARD_CACHE_CONTROL
     
-    # Calculate most common missing parameters
-    missing_params_count = {}
-    problematic_params_count = {}
-    
-    for analysis in meta_analysis_data["all_analyses"]:
-        for param in analysis.get("missing_parameters", []):
-            param_name = param.get("name", param) if isinstance(param, dict) else param
-            missing_params_count[param_name] = missing_params_count.get(param_name, 0) + 1
-        
-        for param in analysis.get("problematic_parameters", []):
-            problematic_params_count[param] = problematic_params_count.get(param, 0) + 1
+    # Rebuilt only after another analysis has completed
+    cached = _dashboard_cache.get("meta-analysis")
+    if cached is not None:
+        return cached
     
-    # Sort by frequency
-    most_missing = sorted(missing_params_count.items(), key=lambda x: x[1], reverse=True)[:5]
-    most_problematic = sorted(problematic_params_count.items(), key=lambda x: x[1], reverse=True)[:5]
+    # Parameter counts are maintained as each analysis completes
+    most_missing = meta_analysis_data["common_missing_parameters"].most_common(5)
+    most_problematic = meta_analysis_data["common_problematic_parameters"].most_common(5)
     
-    return {
-        "total_reports_analyzed": meta_analysis_data["total_reports_analyzed"],
-        "average_compliance_score": round(meta_analysis_data["average_compliance_score"], 1) if meta_analysis_data["total_reports_analyzed"] > 0 else 0,
+    _dashboard_cache["meta-analysis"] = body = {
+        "total_reports_analyzed": meta_stats.n,
+        "average_compliance_score": round(meta_stats.mean, 1),
+        "compliance_score_std_dev": round(meta_stats.variance ** 0.5, 1),
         "most_commonly_missing_parameters": [{"parameter": p[0], "frequency": p[1]} for p in most_missing],
         "most_common_problematic_parameters": [{"parameter": p[0], "frequency": p[1]} for p in most_problematic],
-        "recent_analyses": meta_analysis_data["all_analyses"][-10:],  # Last 10
+        "recent_analyses": list(itertools.islice(reversed(meta_analysis_data["all_analyses"]), 10))[::-1],  # Last 10
         "insights": {
             "trend": "Most reports focus on symptoms rather than root causes",
             "main_issue": "Lack of hypoxic volume calculations and DO profiling",
             "recommendation": "Industry needs education on importance of bathymetry and DO dynamics"
         }
     }
+    return body
+
+class ContactInfo(BaseModel):
+    """Contact details sent as JSON in the /upload contact_info form field"""
+    # Numbers are accepted as text, as the plain JSON parsing before this did
+    model_config = ConfigDict(extra="allow", coerce_numbers_to_str=True)
+    
+    # Required, but checked in parse_contact_info so null gets the same
+    # "Missing required field" error as an absent or empty value
+    name: Optional[str] = None
+    organization: Optional[str] = None
+    email: Optional[str] = None  # Optional - users download reports directly
+    documentType: Optional[str] = "auto"  # Hint only; AI detects the type
+
+async def parse_contact_info(contact_info: str = Form(...)) -> ContactInfo:
+    """Parse and validate the contact_info form field in one pass"""
+    try:
+        contact = ContactInfo.model_validate_json(contact_info)
+    except ValidationError:
+        raise HTTPException(status_code=400, detail="Invalid contact information")
+    
+    # Validate required fields (email removed - users download reports directly)
+    for field in ("name", "organization"):
+        if not getattr(contact, field):
+            raise HTTPException(status_code=400, detail=f"Missing required field: {field}")
+    return contact
 
 @app.post(f"{settings.api_prefix}/upload")
 async def upload_documents(
     background_tasks: BackgroundTasks,
     files: List[UploadFile] = File(...),
-    contact_info: str = Form(...)
+    contact: ContactInfo = Depends(parse_contact_info)
 ):
     """
     Upload documents for hybrid analysis.
@@ -724,23 +1234,12 @@ async def upload_documents(
     
     Document type selection is NO LONGER REQUIRED - the AI will figure it out.
     """
-    import json
-    
-    # Parse contact info JSON
-    try:
-        contact_data = json.loads(contact_info)
-    except:
-        raise HTTPException(status_code=400, detail="Invalid contact information")
-    
-    # Validate required fields (email removed - users download reports directly)
-    required_fields = ['name', 'organization']
-    for field in required_fields:
-        if not contact_data.get(field):
-            raise HTTPException(status_code=400, detail=f"Missing required field: {field}")
+    # Stored with each analysis; unset optional fields are left out
+    contact_data = contact.model_dump(exclude_none=True)
     
     # Document type is now optional - AI will detect it
     # If provided, it's used as a hint but hybrid analysis is still performed
-    document_type_hint = contact_data.get('documentType', 'auto')
+    document_type_hint = contact.documentType
     
     if len(files) > 3:
         raise HTTPException(
@@ -748,24 +1247,35 @@ async def upload_documents(
             detail="Maximum 3 documents allowed per submission"
         )
     
-    submission_id = str(uuid.uuid4())
+    submission_id = str(uuid7())
     analysis_ids = []
     
-    for file in files:
-        if not file.filename.lower().endswith('.pdf'):
-            continue
-        
-        # Process each file
-        analysis_id = str(uuid.uuid4())
-        contents = await file.read()
-        
-        # Save file
-        upload_path = settings.upload_dir / f"{analysis_id}_{file.filename}"
-        with open(upload_path, "wb") as f:
-            f.write(contents)
-        
+    # Stream every file to disk in worker threads, never holding one all in
+    # memory. All of them must pass the size check before any is recorded or
+    # queued, so a rejected submission leaves nothing half-processed behind.
+    uploads = [
+        (str(uuid7()), file) for file in files
+        if file.filename.lower().endswith('.pdf')
+    ]
+    upload_paths = [
+        settings.upload_dir / f"{analysis_id}_{file.filename}"
+        for analysis_id, file in uploads
+    ]
+    copied = await asyncio.gather(*(
+        asyncio.to_thread(_copy_upload, file.file, upload_path, settings.max_upload_size)
+        for (_, file), upload_path in zip(uploads, upload_paths)
+    ), return_exceptions=True)
+    failure = next((result for result in copied if isinstance(result, BaseException)), None)
+    if failure is not None:
+        # Remove the copies that succeeded along with any partial ones
+        for upload_path in upload_paths:
+            with suppress(FileNotFoundError):
+                await aiofiles.os.remove(upload_path)
+        raise failure
+    
+    for (analysis_id, file), upload_path in zip(uploads, upload_paths):
         # Store result - document type will be auto-detected
-        analysis_results[analysis_id] = {
+        await _add_analysis(analysis_id, {
             "id": analysis_id,
             "submission_id": submission_id,
             "filename": file.filename,
@@ -775,17 +1285,13 @@ async def upload_documents(
             "document_type_hint": document_type_hint,  # User hint if provided
             "status": "queued",
             "file_path": str(upload_path)
-        }
+        })
         
         analysis_ids.append(analysis_id)
         
-        # Add to background tasks - document type will be auto-detected
-        background_tasks.add_task(
-            process_document_with_type,
-            analysis_id,
-            str(upload_path),
-            document_type_hint  # Pass hint, but hybrid analysis will be used
-        )
+        # Queue for processing - document type will be auto-detected
+        # (hint is passed along, but hybrid analysis will be used)
+        processing_queue.put_nowait((analysis_id, str(upload_path), document_type_hint))
     
     # Store metadata for trend analysis if multiple reports
     if len(analysis_ids) >= 3:
@@ -798,6 +1304,8 @@ async def upload_documents(
         }
         
         # Add background task to check for Lake Assessment opportunity
+        _submission_events[submission_id] = asyncio.Event()
+        _submission_dequeued[submission_id] = asyncio.Event()
         background_tasks.add_task(
             check_and_trigger_assessment,
             submission_id
@@ -805,16 +1313,18 @@ async def upload_documents(
         logger.info(f"Lake Assessment check scheduled for submission {submission_id}")
     
     # Send admin notification if email is configured
-    if email_service.is_configured() and analysis_ids:
+    if get_email_service().is_configured() and analysis_ids:
         document_names = [analysis_results[aid]["filename"] for aid in analysis_ids]
-        email_service.send_admin_notification(
+        background_tasks.add_task(
+            _send_email,
+            get_email_service().send_admin_notification,
             customer_name=contact_data.get("name", "Unknown"),
             customer_email=contact_data.get("email", "Unknown"),
             organization=contact_data.get("organization", "Unknown"),
             document_names=document_names,
             submission_id=submission_id
         )
-        logger.info(f"Admin notification sent for submission {submission_id}")
+        logger.info(f"Admin notification queued for submission {submission_id}")
     
     return {
         "success": True,
@@ -833,16 +1343,16 @@ async def batch_upload_legacy(
 ):
     """Legacy batch upload endpoint - redirects to new endpoint with hybrid analysis"""
     # For backward compatibility - now uses hybrid analysis
-    contact_info = json.dumps({
-        "name": "Unknown",
-        "email": email or "unknown@example.com",
-        "organization": "Unknown"
+    contact = ContactInfo(
+        name="Unknown",
+        email=email or "unknown@example.com",
+        organization="Unknown"
         # documentType is no longer required - AI will auto-detect
-    })
+    )
     
-    return await upload_documents(background_tasks, files, contact_info)
+    return await upload_documents(background_tasks, files, contact)
     
-    batch_id = str(uuid.uuid4())
+    batch_id = str(uuid7())
     analysis_ids = []
     
     for file in files:
@@ -850,16 +1360,14 @@ async def batch_upload_legacy(
             continue
         
         # Process each file
-        analysis_id = str(uuid.uuid4())
-        contents = await file.read()
+        analysis_id = str(uuid7())
         
         # Save file
         upload_path = settings.upload_dir / f"{analysis_id}_{file.filename}"
-        with open(upload_path, "wb") as f:
-            f.write(contents)
+        await asyncio.to_thread(_copy_upload, file.file, upload_path, settings.max_upload_size)
         
         # Store result
-        analysis_results[analysis_id] = {
+        await _add_analysis(analysis_id, {
             "id": analysis_id,
             "batch_id": batch_id,
             "filename": file.filename,
@@ -867,7 +1375,7 @@ async def batch_upload_legacy(
             "email": email,
             "status": "queued",
             "file_path": str(upload_path)
-        }
+        })
         
         analysis_ids.append(analysis_id)
         
@@ -887,12 +1395,10 @@ async def batch_upload_legacy(
     }
 
 @app.get(f"{settings.api_prefix}/batch/{{batch_id}}")
-async def get_batch_status(batch_id: str):
+async def get_batch_status(batch_id: str, response: Response):
     """Get status of batch processing"""
-    batch_analyses = [
-        r for r in analysis_results.values() 
-        if r.get("batch_id") == batch_id
-    ]
+    response.headers["Cache-Control"] = DASHBOARD_CACHE_CONTROL
+    batch_analyses = await _load_analyses(batch_index.get(batch_id, ()))
     
     if not batch_analyses:
         raise HTTPException(status_code=404, detail="Batch not found")
@@ -936,8 +1442,7 @@ async def update_compliance_rules(rules: dict):
     
     # Save to file (in production, use database)
     rules_path = Path(__file__).parent.parent / "compliance_rules.json"
-    with open(rules_path, "w") as f:
-        json.dump(rules, f, indent=2)
+    await asyncio.to_thread(rules_path.write_bytes, orjson.dumps(rules, option=orjson.OPT_INDENT_2))
     
     return {"message": "Rules updated successfully"}
 
@@ -964,12 +1469,10 @@ async def perform_trend_analysis(
         }
     
     # Collect all analyzed reports
-    reports = []
-    for aid in analysis_ids:
-        if aid in analysis_results:
-            result = analysis_results[aid]
-            if result.get("status") == "complete":
-                reports.append(result)
+    reports = [
+        result for result in await _load_analyses(analysis_ids)
+        if result.get("status") == "complete"
+    ]
     
     if len(reports) < 3:
         return {
@@ -978,7 +1481,7 @@ async def perform_trend_analysis(
         }
     
     # Perform Lake Assessment
-    assessment_results = lake_assessment.perform_assessment(reports)
+    assessment_results = get_lake_assessment().perform_assessment(reports)
     
     if not assessment_results:
         return {
@@ -989,7 +1492,7 @@ async def perform_trend_analysis(
     # Generate Lake Assessment reports
     assessment_paths = {}
     for lake_name, assessment_data in assessment_results.items():
-        report_path = lake_assessment_report.generate_assessment_report(assessment_data)
+        report_path = get_lake_assessment_report().generate_assessment_report(assessment_data)
         assessment_paths[lake_name] = report_path
     
     # Store results
@@ -999,16 +1502,14 @@ async def perform_trend_analysis(
     
     # Send notification with Lake Assessment report
     contact_info = meta_data.get("contact_info", {})
-    if email_service.is_configured() and assessment_paths:
-        # Send email with Lake Assessment attached
-        for lake_name, report_path in assessment_paths.items():
-            email_service.send_lake_assessment_notification(
-                customer_name=contact_info.get("name", "Unknown"),
-                customer_email=contact_info.get("email", "Unknown"),
-                lake_name=lake_name,
-                report_path=report_path,
-                year_range=assessment_results[lake_name].get("year_range", "Unknown")
-            )
+    if get_email_service().is_configured() and assessment_paths:
+        # Send email with Lake Assessment attached, after the response
+        background_tasks.add_task(
+            _send_lake_assessment_emails,
+            contact_info,
+            assessment_paths,
+            assessment_results
+        )
     
     return {
         "success": True,
@@ -1030,12 +1531,11 @@ async def get_trend_analysis_status(submission_id: str):
     # Check status of individual analyses
     completed = 0
     in_progress = 0
-    for aid in analysis_ids:
-        if aid in analysis_results:
-            if analysis_results[aid]["status"] == "complete":
-                completed += 1
-            else:
-                in_progress += 1
+    for result in await _load_analyses(analysis_ids):
+        if result["status"] == "complete":
+            completed += 1
+        else:
+            in_progress += 1
     
     # Check if Lake Assessment was performed
     assessment_complete = meta_data.get("assessment_complete", False)
@@ -1053,7 +1553,7 @@ async def get_trend_analysis_status(submission_id: str):
     }
 
 @app.get(f"{settings.api_prefix}/meta-analysis/{{submission_id}}/report/{{lake_name}}")
-async def download_assessment_report(submission_id: str, lake_name: str):
+async def download_assessment_report(submission_id: str, lake_name: str, request: Request):
     """Download a Lake Assessment report"""
     if submission_id not in meta_analysis_data:
         raise HTTPException(status_code=404, detail="Submission not found")
@@ -1066,67 +1566,63 @@ async def download_assessment_report(submission_id: str, lake_name: str):
     
     report_path = assessment_reports[lake_name]
     
-    if not Path(report_path).exists():
-        raise HTTPException(status_code=404, detail="Report file not found")
-    
-    return FileResponse(
-        report_path,
-        media_type='application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-        filename=f"{lake_name}_Lake_Assessment.docx"
-    )
+    return await _download_response(request, report_path, f"{lake_name}_Lake_Assessment.docx")
 
 # Add background task to automatically trigger Lake Assessment
 async def check_and_trigger_assessment(submission_id: str):
-    """Background task to check and trigger Lake Assessment when reports are complete"""
-    import asyncio
-    
-    # Wait for all reports to complete (max 5 minutes)
-    max_wait = 300  # 5 minutes
-    start_time = datetime.now()
+    """Background task to trigger Lake Assessment once the submission's reports are processed"""
+    event = _submission_events.get(submission_id)
+    dequeued = _submission_dequeued.get(submission_id)
+    if event is None or dequeued is None:
+        return
+    if _submission_dequeued_all(submission_id):
+        dequeued.set()
+    if _submission_finished(submission_id):
+        event.set()
     
-    while (datetime.now() - start_time).total_seconds() < max_wait:
-        meta_data = meta_analysis_data.get(submission_id)
-        if not meta_data:
-            return
-        
-        analysis_ids = meta_data.get("analysis_ids", [])
-        all_complete = True
-        reports = []
-        
-        for aid in analysis_ids:
-            if aid in analysis_results:
-                result = analysis_results[aid]
-                if result["status"] != "complete":
-                    all_complete = False
-                    break
-                reports.append(result)
-        
-        if all_complete and len(reports) >= 3:
-            # Check if Lake Assessment should be performed
-            if lake_assessment.should_perform_assessment(reports):
-                logger.info(f"Automatically triggering Lake Assessment for submission {submission_id}")
+    try:
+        # Time spent waiting behind other uploads in processing_queue doesn't
+        # count; the 5 minute limit starts once the last report is picked up
+        await dequeued.wait()
+        await asyncio.wait_for(event.wait(), timeout=300)
+    except asyncio.TimeoutError:
+        logger.info(f"Reports for submission {submission_id} did not finish in time for Lake Assessment")
+        return
+    finally:
+        _submission_events.pop(submission_id, None)
+        _submission_dequeued.pop(submission_id, None)
+    
+    meta_data = meta_analysis_data.get(submission_id)
+    if not meta_data:
+        return
+    
+    reports = await _load_analyses(meta_data.get("analysis_ids", []))
+    if any(result["status"] != "complete" for result in reports):
+        return
+    
+    if len(reports) >= 3:
+        # Check if Lake Assessment should be performed (grouping once for both steps)
+        lake_groups = get_lake_assessment().group_reports_by_lake(reports)
+        if get_lake_assessment().should_perform_assessment(reports, lake_groups):
+            logger.info(f"Automatically triggering Lake Assessment for submission {submission_id}")
+            
+            # Perform assessment
+            assessment_results = get_lake_assessment().perform_assessment(reports, lake_groups)
+            
+            if assessment_results:
+                # Generate reports
+                assessment_paths = {}
+                for lake_name, assessment_data in assessment_results.items():
+                    report_path = get_lake_assessment_report().generate_assessment_report(assessment_data)
+                    assessment_paths[lake_name] = report_path
                 
-                # Perform assessment
-                assessment_results = lake_assessment.perform_assessment(reports)
+                # Store results
+                meta_data["assessment_complete"] = True
+                meta_data["assessment_reports"] = assessment_paths
+                meta_data["assessment_timestamp"] = datetime.now().isoformat()
+                meta_data["assessment_auto_triggered"] = True
                 
-                if assessment_results:
-                    # Generate reports
-                    assessment_paths = {}
-                    for lake_name, assessment_data in assessment_results.items():
-                        report_path = lake_assessment_report.generate_assessment_report(assessment_data)
-                        assessment_paths[lake_name] = report_path
-                    
-                    # Store results
-                    meta_data["assessment_complete"] = True
-                    meta_data["assessment_reports"] = assessment_paths
-                    meta_data["assessment_timestamp"] = datetime.now().isoformat()
-                    meta_data["assessment_auto_triggered"] = True
-                    
-                    logger.info(f"Lake Assessment completed for submission {submission_id}")
-            return
-        
-        # Wait 10 seconds before checking again
-        await asyncio.sleep(10)
+                logger.info(f"Lake Assessment completed for submission {submission_id}")
 
 if __name__ == "__main__":
     import uvicorn
@@ -1134,5 +1630,10 @@ if __name__ == "__main__":
         "main:app",
         host=settings.host,
         port=settings.port,
-        reload=settings.reload
+        reload=settings.reload,
+        loop=settings.server_loop,
+        http=settings.server_http,
+        # Single process: submission state (indexes, events, WebSocket
+        # watchers, the processing queue) lives in this process's memory
+        workers=1
     )
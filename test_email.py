@@ -4,6 +4,8 @@ Tests email configuration and sends a test email
 """
 import sys
 import os
+import threading
+from string import Template
 
 # Add backend to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -11,7 +13,31 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from config import settings
 from core.email_service import EmailService
 
-def test_email_configuration():
+# Protocol tracing prints every SMTP line; set SMTP_DEBUG=1 to turn it on
+SMTP_DEBUG = 1 if os.environ.get("SMTP_DEBUG") else 0
+
+# Seconds main() waits for the test email before moving on
+SEND_TIMEOUT = 60
+
+TEST_EMAIL_TEMPLATE = Template("""
+        <html>
+        <body style="font-family: Arial, sans-serif;">
+            <h2>Test Email - Report to Reveal</h2>
+            <p>This is a test email sent at ${sent_at}</p>
+            <p>If you received this email, your email configuration is working correctly!</p>
+            <hr>
+            <p style="color: #666; font-size: 12px;">
+            Configuration used:<br>
+            - SMTP Host: ${host}<br>
+            - SMTP Port: ${port}<br>
+            - TLS: ${tls}<br>
+            - From: ${from_email}
+            </p>
+        </body>
+        </html>
+        """)
+
+def test_email_configuration(email_service):
     """Test email configuration"""
     print("=" * 60)
     print("EMAIL CONFIGURATION TEST")
@@ -28,9 +54,6 @@ def test_email_configuration():
     print(f"   ADMIN_EMAIL: {settings.admin_email or '(not set)'}")
     print(f"   SEND_REPORTS_AUTOMATICALLY: {settings.send_reports_automatically}")
     
-    # Initialize email service
-    email_service = EmailService(settings)
-    
     print("\n2. Email service configuration status:")
     if email_service.is_configured():
         print("   [OK] Email service is properly configured")
@@ -49,12 +72,10 @@ def test_email_configuration():
     
     return True
 
-def send_test_email():
+def send_test_email(email_service):
     """Send a test email"""
     print("\n3. Attempting to send test email...")
     
-    email_service = EmailService(settings)
-    
     if not email_service.is_configured():
         print("   Cannot send test email - email service not configured")
         return False
@@ -79,23 +100,13 @@ def send_test_email():
         msg['To'] = test_recipient
         msg['Subject'] = "Test Email - Report to Reveal System"
         
-        body_html = f"""
-        <html>
-        <body style="font-family: Arial, sans-serif;">
-            <h2>Test Email - Report to Reveal</h2>
-            <p>This is a test email sent at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-            <p>If you received this email, your email configuration is working correctly!</p>
-            <hr>
-            <p style="color: #666; font-size: 12px;">
-            Configuration used:<br>
-            - SMTP Host: {email_service.smtp_host}<br>
-            - SMTP Port: {email_service.smtp_port}<br>
-            - TLS: {email_service.use_tls}<br>
-            - From: {email_service.from_email}
-            </p>
-        </body>
-        </html>
-        """
+        body_html = TEST_EMAIL_TEMPLATE.substitute(
+            sent_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            host=email_service.smtp_host,
+            port=email_service.smtp_port,
+            tls=email_service.use_tls,
+            from_email=email_service.from_email
+        )
         msg.attach(MIMEText(body_html, 'html'))
         
         # Connect and send
@@ -106,7 +117,7 @@ def send_test_email():
             import ssl
             context = ssl.create_default_context()
             with smtplib.SMTP_SSL(email_service.smtp_host, email_service.smtp_port, context=context, timeout=30) as server:
-                server.set_debuglevel(1)  # Enable debug output
+                server.set_debuglevel(SMTP_DEBUG)
                 print("   SSL Connection established")
                 
                 print("   Logging in...")
@@ -118,7 +129,7 @@ def send_test_email():
                 print("   [SUCCESS] Email sent successfully!")
         else:
             with smtplib.SMTP(email_service.smtp_host, email_service.smtp_port, timeout=30) as server:
-                server.set_debuglevel(1)  # Enable debug output
+                server.set_debuglevel(SMTP_DEBUG)
                 print("   Connection established")
                 
                 if email_service.use_tls:
@@ -161,14 +172,17 @@ def send_test_email():
         print(f"\n   [ERROR] UNEXPECTED ERROR: {type(e).__name__}: {e}")
         return False
 
-def main():
+def main(send=False):
     """Main test function"""
     print("\n" + "=" * 60)
     print("REPORT TO REVEAL - EMAIL SYSTEM TEST")
     print("=" * 60)
     
+    # One service instance is shared by both steps
+    email_service = EmailService(settings)
+    
     # Test configuration
-    config_ok = test_email_configuration()
+    config_ok = test_email_configuration(email_service)
     
     if not config_ok:
         print("\n" + "=" * 60)
@@ -195,12 +209,20 @@ def main():
         """)
         return
     
-    # Ask to send test email
+    # Ask to send test email (--send skips the prompt for unattended runs)
     print("\n" + "-" * 60)
-    response = input("Would you like to send a test email? (y/n): ").strip().lower()
+    if not send:
+        response = input("Would you like to send a test email? (y/n): ").strip().lower()
+        send = response == 'y'
     
-    if response == 'y':
-        send_test_email()
+    if send:
+        # Run the SMTP exchange on a daemon thread so a stalled server can't
+        # hang the script; a send still in flight is abandoned at exit
+        sender = threading.Thread(target=send_test_email, args=(email_service,), daemon=True)
+        sender.start()
+        sender.join(timeout=SEND_TIMEOUT)
+        if sender.is_alive():
+            print(f"   Test email still sending after {SEND_TIMEOUT}s, not waiting for it")
     else:
         print("   Skipping test email")
     
@@ -209,5 +231,5 @@ def main():
     print("=" * 60)
 
 if __name__ == "__main__":
-    main()
+    main(send="--send" in sys.argv[1:])
 
@@ -5,8 +5,11 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+import functools
 import smtplib
+import socket
 import ssl
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
@@ -18,44 +21,73 @@ SMTP_USER = settings.smtp_user
 SMTP_PASSWORD = settings.smtp_password
 TO_EMAIL = settings.admin_email
 
-def test_port_587_starttls():
+@functools.lru_cache(maxsize=None)
+def resolve(host):
+    """Look up a host's addresses once; every later connection reuses them"""
+    infos = socket.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+    return tuple(dict.fromkeys(info[4][0] for info in infos))
+
+class CachedDNSMixin:
+    """
+    Connect to the cached addresses of the SMTP host instead of resolving it
+    again. TLS still verifies the certificate against the original hostname.
+    """
+    def _get_socket(self, host, port, timeout):
+        error = None
+        for address in resolve(host):
+            try:
+                return super()._get_socket(address, port, timeout)
+            except OSError as e:
+                error = e
+        raise error
+
+class SMTP(CachedDNSMixin, smtplib.SMTP):
+    pass
+
+class SMTP_SSL(CachedDNSMixin, smtplib.SMTP_SSL):
+    pass
+
+# The two probes run at the same time, so each collects its progress lines
+# in `log` and they are printed together once both have finished
+
+def test_port_587_starttls(log):
     """Test SMTP with STARTTLS on port 587"""
-    print("\n" + "=" * 50)
-    print("TEST 1: Port 587 with STARTTLS")
-    print("=" * 50)
+    log.append("\n" + "=" * 50)
+    log.append("TEST 1: Port 587 with STARTTLS")
+    log.append("=" * 50)
     try:
-        print("Connecting...")
-        server = smtplib.SMTP(SMTP_HOST, 587, timeout=10)
-        print("Connected!")
-        print("Starting TLS...")
+        log.append("Connecting...")
+        server = SMTP(SMTP_HOST, 587, timeout=10)
+        log.append("Connected!")
+        log.append("Starting TLS...")
         server.starttls()
-        print("TLS started!")
-        print("Logging in...")
+        log.append("TLS started!")
+        log.append("Logging in...")
         server.login(SMTP_USER, SMTP_PASSWORD)
-        print("Login successful!")
+        log.append("Login successful!")
         server.quit()
         return True
     except Exception as e:
-        print(f"FAILED: {type(e).__name__}: {e}")
+        log.append(f"FAILED: {type(e).__name__}: {e}")
         return False
 
-def test_port_465_ssl():
+def test_port_465_ssl(log):
     """Test SMTP with SSL on port 465"""
-    print("\n" + "=" * 50)
-    print("TEST 2: Port 465 with SSL")
-    print("=" * 50)
+    log.append("\n" + "=" * 50)
+    log.append("TEST 2: Port 465 with SSL")
+    log.append("=" * 50)
     try:
-        print("Connecting with SSL...")
+        log.append("Connecting with SSL...")
         context = ssl.create_default_context()
-        server = smtplib.SMTP_SSL(SMTP_HOST, 465, context=context, timeout=10)
-        print("Connected!")
-        print("Logging in...")
+        server = SMTP_SSL(SMTP_HOST, 465, context=context, timeout=10)
+        log.append("Connected!")
+        log.append("Logging in...")
         server.login(SMTP_USER, SMTP_PASSWORD)
-        print("Login successful!")
+        log.append("Login successful!")
         server.quit()
         return True
     except Exception as e:
-        print(f"FAILED: {type(e).__name__}: {e}")
+        log.append(f"FAILED: {type(e).__name__}: {e}")
         return False
 
 def send_test_email_ssl():
@@ -82,7 +114,7 @@ def send_test_email_ssl():
         msg.attach(MIMEText(body, 'html'))
         
         context = ssl.create_default_context()
-        with smtplib.SMTP_SSL(SMTP_HOST, 465, context=context, timeout=30) as server:
+        with SMTP_SSL(SMTP_HOST, 465, context=context, timeout=30) as server:
             server.login(SMTP_USER, SMTP_PASSWORD)
             server.send_message(msg)
             print("[SUCCESS] Email sent!")
@@ -97,9 +129,20 @@ if __name__ == "__main__":
     print(f"Using: {SMTP_USER}")
     print(f"To: {TO_EMAIL}")
     
-    # Test both methods
-    result_587 = test_port_587_starttls()
-    result_465 = test_port_465_ssl()
+    # Resolve the SMTP host once, up front, for all probes and the test send
+    try:
+        resolve(SMTP_HOST)
+    except OSError as e:
+        print(f"Could not resolve {SMTP_HOST}: {e}")
+    
+    # Test both methods concurrently - total time is the slower probe, not the sum
+    log_587, log_465 = [], []
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        probe_587 = pool.submit(test_port_587_starttls, log_587)
+        probe_465 = pool.submit(test_port_465_ssl, log_465)
+        result_587 = probe_587.result()
+        result_465 = probe_465.result()
+    print("\n".join(log_587 + log_465))
     
     print("\n" + "=" * 50)
     print("RESULTS:")
@@ -3,16 +3,19 @@ Test script for Lake Assessment trend analysis feature
 Tests with real lake reports from the document folder
 """
 
-import requests
+import aiofiles
+import asyncio
+import httpx
 import json
-import time
+from contextlib import ExitStack
 from pathlib import Path
+from urllib.parse import quote
 
-# Server configuration
-BASE_URL = "http://localhost:8000"
-API_PREFIX = "/api/v1"
+from trend_test_helpers import API_PREFIX, BASE_URL, backoff_delay, existing_paths, fetch_statuses
 
-def test_trend_analysis():
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+async def test_trend_analysis(client):
     """Test the Lake Assessment feature with multiple reports from the same lake"""
     
     print("=" * 80)
@@ -37,8 +40,9 @@ def test_trend_analysis():
     # Check if files exist
     print("\n1. CHECKING TEST FILES")
     print("-" * 40)
+    found = existing_paths(test_files)
     for file_path in test_files:
-        if Path(file_path).exists():
+        if file_path in found:
             print(f"   [OK] {Path(file_path).name}")
         else:
             print(f"   [ERROR] File not found: {file_path}")
@@ -55,29 +59,24 @@ def test_trend_analysis():
     print("\n2. UPLOADING REPORTS")
     print("-" * 40)
     
-    # Prepare files for upload
-    files = []
-    for file_path in test_files:
-        files.append(
-            ('files', (Path(file_path).name, open(file_path, 'rb'), 'application/pdf'))
-        )
-    
     # Prepare form data
     data = {
         'contact_info': json.dumps(contact_info)
     }
     
-    # Upload files
+    # Upload files - httpx streams each open handle in 64 KB chunks rather
+    # than reading whole PDFs into memory; the stack closes them even on error
     try:
-        response = requests.post(
-            f"{BASE_URL}{API_PREFIX}/upload",
-            files=files,
-            data=data
-        )
-        
-        # Close file handles
-        for _, file_tuple in files:
-            file_tuple[1].close()
+        with ExitStack() as stack:
+            files = [
+                ('files', (Path(file_path).name, stack.enter_context(open(file_path, 'rb')), 'application/pdf'))
+                for file_path in test_files
+            ]
+            response = await client.post(
+                f"{API_PREFIX}/upload",
+                files=files,
+                data=data
+            )
         
         if response.status_code == 200:
             result = response.json()
@@ -102,29 +101,35 @@ def test_trend_analysis():
     
     # Wait for individual analyses to complete (max 2 minutes)
     max_wait = 120
-    check_interval = 5
     elapsed = 0
+    attempt = 0
+    poll_cache = {}
+    pending = list(analysis_ids)
+    previous = None
     
     while elapsed < max_wait:
-        all_complete = True
-        for analysis_id in analysis_ids:
-            try:
-                response = requests.get(f"{BASE_URL}{API_PREFIX}/analyze/{analysis_id}")
-                if response.status_code == 200:
-                    analysis_data = response.json()
-                    status = analysis_data.get('status', 'unknown')
-                    if status != 'complete':
-                        all_complete = False
-                        print(f"   Analysis {analysis_id[:8]}... Status: {status}")
-            except:
-                all_complete = False
+        statuses = await fetch_statuses(client, pending, poll_cache)
+        if statuses != previous:
+            # Something moved - poll quickly again around the change
+            attempt = 0
+            previous = statuses
+        # Completed analyses are final, so stop asking about them
+        still_pending = []
+        for analysis_id, status in zip(pending, statuses):
+            if status != 'complete':
+                still_pending.append(analysis_id)
+                if status is not None:
+                    print(f"   Analysis {analysis_id[:8]}... Status: {status}")
+        pending = still_pending
         
-        if all_complete:
+        if not pending:
             print("   [OK] All analyses complete!")
             break
         
-        time.sleep(check_interval)
-        elapsed += check_interval
+        delay = backoff_delay(attempt)
+        await asyncio.sleep(delay)
+        elapsed += delay
+        attempt += 1
     
     if elapsed >= max_wait:
         print("   [WARNING] Timeout waiting for analyses to complete")
@@ -134,7 +139,7 @@ def test_trend_analysis():
     
     # Check if Lake Assessment was triggered
     try:
-        response = requests.get(f"{BASE_URL}{API_PREFIX}/meta-analysis/{submission_id}/status")
+        response = await client.get(f"{API_PREFIX}/meta-analysis/{submission_id}/status")
         
         if response.status_code == 200:
             status_data = response.json()
@@ -158,8 +163,8 @@ def test_trend_analysis():
     
     # Try to manually trigger assessment
     try:
-        response = requests.post(
-            f"{BASE_URL}{API_PREFIX}/meta-analysis/trend",
+        response = await client.post(
+            f"{API_PREFIX}/meta-analysis/trend",
             params={"submission_id": submission_id}
         )
         
@@ -170,11 +175,13 @@ def test_trend_analysis():
                 print(f"   Lakes analyzed: {result.get('lakes_analyzed')}")
                 print(f"   Assessment reports: {result.get('assessment_reports')}")
                 
-                # Download assessment report
+                # Download every lake's assessment report at once
                 if result.get('assessment_reports'):
-                    for lake_name in result['lakes_analyzed']:
-                        print(f"\n   Downloading report for {lake_name}...")
-                        download_assessment_report(submission_id, lake_name)
+                    print(f"\n   Downloading reports for {', '.join(result['lakes_analyzed'])}...")
+                    await asyncio.gather(*(
+                        download_assessment_report(client, submission_id, lake_name)
+                        for lake_name in result['lakes_analyzed']
+                    ))
             else:
                 print(f"   [INFO] {result.get('message')}")
         else:
@@ -187,25 +194,25 @@ def test_trend_analysis():
     print("TEST COMPLETE")
     print("=" * 80)
 
-def download_assessment_report(submission_id: str, lake_name: str):
+async def download_assessment_report(client, submission_id: str, lake_name: str):
     """Download a Lake Assessment report"""
     try:
         # URL encode the lake name
-        import urllib.parse
-        encoded_lake_name = urllib.parse.quote(lake_name.lower())
+        encoded_lake_name = quote(lake_name.lower())
         
-        response = requests.get(
-            f"{BASE_URL}{API_PREFIX}/meta-analysis/{submission_id}/report/{encoded_lake_name}"
-        )
-        
-        if response.status_code == 200:
-            # Save the report
-            output_path = f"Lake_Assessment_{lake_name.replace(' ', '_')}.docx"
-            with open(output_path, 'wb') as f:
-                f.write(response.content)
-            print(f"   [OK] Report saved as: {output_path}")
-        else:
-            print(f"   [ERROR] Failed to download report: {response.status_code}")
+        # Stream the body straight to disk instead of holding the whole .docx
+        async with client.stream(
+            "GET", f"{API_PREFIX}/meta-analysis/{submission_id}/report/{encoded_lake_name}"
+        ) as response:
+            if response.status_code == 200:
+                # Save the report
+                output_path = f"Lake_Assessment_{lake_name.replace(' ', '_')}.docx"
+                async with aiofiles.open(output_path, 'wb') as f:
+                    async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                        await f.write(chunk)
+                print(f"   [OK] Report saved as: {output_path}")
+            else:
+                print(f"   [ERROR] Failed to download report: {response.status_code}")
     except Exception as e:
         print(f"   [ERROR] Download exception: {e}")
 
@@ -229,34 +236,42 @@ def test_with_different_lakes():
         ]
     }
     
+    # Every set lives in the same folder, so this is one directory listing
+    found = existing_paths(f for files in lake_sets.values() for f in files)
+    
     for lake_name, files in lake_sets.items():
         print(f"\nTesting {lake_name}...")
         print("-" * 40)
         
         # Check if we have enough files
-        existing_files = [f for f in files if Path(f).exists()]
+        existing_files = [f for f in files if f in found]
         if len(existing_files) >= 3:
             print(f"   Found {len(existing_files)} reports for {lake_name}")
             # You could call the upload process here for each set
         else:
             print(f"   Insufficient files for {lake_name}")
 
-if __name__ == "__main__":
-    # Make sure the server is running
-    try:
-        response = requests.get(f"{BASE_URL}/health")
-        if response.status_code == 200:
-            print("Server is running and healthy!")
-        else:
-            print("Server health check failed!")
+async def main():
+    # One client (and its keep-alive connections) for the whole run
+    async with httpx.AsyncClient(base_url=BASE_URL, timeout=120) as client:
+        # Make sure the server is running
+        try:
+            response = await client.get("/health")
+            if response.status_code == 200:
+                print("Server is running and healthy!")
+            else:
+                print("Server health check failed!")
+                exit(1)
+        except httpx.HTTPError:
+            print("ERROR: Server is not running!")
+            print("Please start the server first: python main.py")
             exit(1)
-    except:
-        print("ERROR: Server is not running!")
-        print("Please start the server first: python main.py")
-        exit(1)
-    
-    # Run the main test
-    test_trend_analysis()
+        
+        # Run the main test
+        await test_trend_analysis(client)
     
     # Optionally test other lake sets
     # test_with_different_lakes()
+
+if __name__ == "__main__":
+    asyncio.run(main())
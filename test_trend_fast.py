@@ -2,15 +2,16 @@
 Fast test for Lake Assessment - skips AI analysis for quick testing
 """
 
-import requests
+import asyncio
+import httpx
 import json
 import time
+from contextlib import ExitStack
 from pathlib import Path
 
-BASE_URL = "http://localhost:8000"
-API_PREFIX = "/api/v1"
+from trend_test_helpers import API_PREFIX, BASE_URL, backoff_delay, fetch_statuses
 
-def test_trend_analysis_fast():
+async def test_trend_analysis_fast(client):
     """Test Lake Assessment with smaller files for faster processing"""
     
     print("=" * 80)
@@ -48,18 +49,15 @@ def test_trend_analysis_fast():
         "documentType": "report"
     }
     
-    files = []
-    for file_path in test_files:
-        files.append(
-            ('files', (Path(file_path).name, open(file_path, 'rb'), 'application/pdf'))
-        )
-    
     data = {'contact_info': json.dumps(contact_info)}
     
-    response = requests.post(f"{BASE_URL}{API_PREFIX}/upload", files=files, data=data)
-    
-    for _, file_tuple in files:
-        file_tuple[1].close()
+    # httpx streams each open handle in 64 KB chunks; the stack closes them
+    with ExitStack() as stack:
+        files = [
+            ('files', (Path(file_path).name, stack.enter_context(open(file_path, 'rb')), 'application/pdf'))
+            for file_path in test_files
+        ]
+        response = await client.post(f"{API_PREFIX}/upload", files=files, data=data)
     
     if response.status_code != 200:
         print(f"   [ERROR] Upload failed: {response.text}")
@@ -78,24 +76,32 @@ def test_trend_analysis_fast():
     
     max_wait = 60  # 60 seconds should be enough without AI
     start = time.time()
+    attempt = 0
+    poll_cache = {}
+    pending = list(analysis_ids)
+    previous = None
     
     while time.time() - start < max_wait:
-        all_complete = True
-        for aid in analysis_ids:
-            resp = requests.get(f"{BASE_URL}{API_PREFIX}/analyze/{aid}")
-            if resp.status_code == 200:
-                status = resp.json().get('status')
-                if status != 'complete':
-                    all_complete = False
+        statuses = await fetch_statuses(client, pending, poll_cache)
+        if statuses != previous:
+            # Something moved - poll quickly again around the change
+            attempt = 0
+            previous = statuses
+        # Completed analyses are final, so stop asking about them
+        still_pending = []
+        for aid, status in zip(pending, statuses):
+            if status != 'complete':
+                still_pending.append(aid)
+                if status is not None:
                     print(f"   {aid[:8]}... {status}")
-            else:
-                all_complete = False
+        pending = still_pending
         
-        if all_complete:
+        if not pending:
             print("   [OK] All analyses complete!")
             break
         
-        time.sleep(2)
+        await asyncio.sleep(backoff_delay(attempt))
+        attempt += 1
     
     elapsed = time.time() - start
     print(f"   Completed in {elapsed:.1f} seconds")
@@ -104,16 +110,22 @@ def test_trend_analysis_fast():
     print("\n4. ANALYSIS RESULTS")
     print("-" * 40)
     
+    # Polling only fetched statuses, so this is the one full read of each
+    # analysis; fetch them all at once
+    responses = await asyncio.gather(
+        *(client.get(f"{API_PREFIX}/analyze/{aid}") for aid in analysis_ids),
+        return_exceptions=True
+    )
+    
     completed_count = 0
-    for aid in analysis_ids:
-        resp = requests.get(f"{BASE_URL}{API_PREFIX}/analyze/{aid}")
-        if resp.status_code == 200:
+    for resp in responses:
+        if not isinstance(resp, Exception) and resp.status_code == 200:
             data = resp.json()
             if data.get('status') == 'complete':
                 completed_count += 1
                 print(f"   {data.get('filename', 'Unknown')[:40]}: Complete")
-                score = data.get('compliance_evaluation', {}).get('overall_score')
-                if score:
+                score = data.get('compliance_score')
+                if score is not None:
                     print(f"     - Compliance Score: {score:.1f}%")
     
     print(f"\n   Completed: {completed_count}/{len(analysis_ids)}")
@@ -123,8 +135,8 @@ def test_trend_analysis_fast():
     print("-" * 40)
     
     if completed_count >= 3:
-        response = requests.post(
-            f"{BASE_URL}{API_PREFIX}/meta-analysis/trend",
+        response = await client.post(
+            f"{API_PREFIX}/meta-analysis/trend",
             params={"submission_id": submission_id}
         )
         
@@ -145,17 +157,22 @@ def test_trend_analysis_fast():
     print("TEST COMPLETE")
     print("=" * 80)
 
-if __name__ == "__main__":
-    # Check server
-    try:
-        resp = requests.get(f"{BASE_URL}/health")
-        if resp.status_code != 200:
-            print("Server not running!")
+async def main():
+    # One client (and its keep-alive connections) for the whole run
+    async with httpx.AsyncClient(base_url=BASE_URL, timeout=120) as client:
+        # Check server
+        try:
+            resp = await client.get("/health")
+            if resp.status_code != 200:
+                print("Server not running!")
+                exit(1)
+        except httpx.HTTPError:
+            print("ERROR: Server not running!")
+            print("Start with: python main.py")
             exit(1)
-    except:
-        print("ERROR: Server not running!")
-        print("Start with: python main.py")
-        exit(1)
-    
-    print("Server is running!")
-    test_trend_analysis_fast()
+        
+        print("Server is running!")
+        await test_trend_analysis_fast(client)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -2,13 +2,34 @@
 Simplified test for Lake Assessment trend analysis
 """
 
-import requests
-import json
+import httpx
+import orjson
+import sys
 import time
+from contextlib import ExitStack
 from pathlib import Path
+from websockets.exceptions import ConnectionClosed
+from websockets.sync.client import connect as ws_connect
 
-BASE_URL = "http://localhost:8000"
-API_PREFIX = "/api/v1"
+from trend_test_helpers import API_PREFIX, BASE_URL, existing_paths
+
+WS_URL = "ws://localhost:8000"
+STATUS_LINE_WIDTH = 100
+
+# contact_info form field for every upload, serialized once
+CONTACT_INFO_JSON = orjson.dumps({
+    "name": "Test User",
+    "email": "test@example.com",
+    "organization": "Test Organization",
+    "documentType": "report"
+})
+
+# One pooled client so every call reuses a keep-alive connection
+CLIENT = httpx.Client(
+    transport=httpx.HTTPTransport(retries=3),
+    limits=httpx.Limits(max_connections=16, max_keepalive_connections=4),
+    timeout=httpx.Timeout(60.0, connect=5.0)
+)
 
 def check_existing_analyses():
     """Check if there are any existing analyses we can use for testing"""
@@ -38,36 +59,29 @@ def simple_trend_test():
     print("\n1. UPLOADING SMALL TEST FILES")
     print("-" * 40)
     
-    # Check files exist
+    # Check files exist (one listing of the shared document folder)
+    found = existing_paths(test_files)
     for f in test_files:
-        if not Path(f).exists():
+        if f not in found:
             print(f"   [ERROR] File not found: {f}")
-            return
+            return None, []
     
     # Upload without AI analysis for faster testing
-    contact_info = {
-        "name": "Test User",
-        "email": "test@example.com",
-        "organization": "Test Organization",
-        "documentType": "report"
-    }
-    
-    files = []
-    for file_path in test_files:
-        files.append(
-            ('files', (Path(file_path).name, open(file_path, 'rb'), 'application/pdf'))
-        )
-    
-    data = {'contact_info': json.dumps(contact_info)}
-    
     try:
-        response = requests.post(f"{BASE_URL}{API_PREFIX}/upload", files=files, data=data)
-        
-        for _, file_tuple in files:
-            file_tuple[1].close()
+        # httpx streams open file objects in chunks as the body is sent,
+        # so no PDF is read into memory whole
+        with ExitStack() as stack:
+            response = CLIENT.post(
+                f"{BASE_URL}{API_PREFIX}/upload",
+                files=[
+                    ('files', (Path(file_path).name, stack.enter_context(open(file_path, 'rb')), 'application/pdf'))
+                    for file_path in test_files
+                ],
+                data={'contact_info': CONTACT_INFO_JSON.decode()}
+            )
         
         if response.status_code == 200:
-            result = response.json()
+            result = orjson.loads(response.content)
             print(f"   [OK] Uploaded {result.get('files_processed')} files")
             print(f"   Submission ID: {result.get('submission_id')}")
             
@@ -85,9 +99,9 @@ def simple_trend_test():
 def check_analysis_details(analysis_id):
     """Get detailed analysis results"""
     try:
-        response = requests.get(f"{BASE_URL}{API_PREFIX}/analyze/{analysis_id}")
+        response = CLIENT.get(f"{BASE_URL}{API_PREFIX}/analyze/{analysis_id}")
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             print(f"\n   Analysis ID: {analysis_id[:8]}...")
             print(f"     Status: {data.get('status')}")
             print(f"     Filename: {data.get('filename')}")
@@ -113,29 +127,66 @@ def check_analysis_details(analysis_id):
         print(f"   [ERROR] {e}")
         return None
 
-def wait_for_completion(analysis_ids, max_wait=60):
-    """Wait for analyses to complete with simpler logic"""
+def wait_for_completion(submission_id, analysis_ids, max_wait=60):
+    """Wait for analyses to complete, following status pushes over a WebSocket"""
     print("\n2. WAITING FOR PROCESSING")
     print("-" * 40)
     
-    start_time = time.time()
-    while time.time() - start_time < max_wait:
-        all_complete = True
-        
-        for aid in analysis_ids:
-            response = requests.get(f"{BASE_URL}{API_PREFIX}/analyze/{aid}")
-            if response.status_code == 200:
-                status = response.json().get('status')
-                if status != 'complete':
-                    all_complete = False
-                    print(f"   {aid[:8]}... {status}")
-        
-        if all_complete:
-            print("   [OK] All analyses complete!")
-            return True
-        
-        time.sleep(3)
+    # On a terminal keep one status line rewritten in place; when output is
+    # redirected, log each status change on its own line instead
+    live = sys.stdout.isatty()
+    line_open = False
     
+    def end_line():
+        nonlocal line_open
+        if line_open:
+            sys.stdout.write("\n")
+            line_open = False
+    
+    deadline = time.time() + max_wait
+    last_status = {}
+    try:
+        ws = ws_connect(
+            f"{WS_URL}{API_PREFIX}/ws/submissions/{submission_id}", open_timeout=max_wait
+        )
+    except Exception as e:
+        print(f"   [ERROR] Could not open status WebSocket: {e}")
+        return False
+    
+    try:
+        while time.time() < deadline:
+            update = orjson.loads(ws.recv(timeout=deadline - time.time()))
+            
+            if live:
+                line = " | ".join(f"{aid[:8]}: {update['statuses'].get(aid)}" for aid in analysis_ids)
+                sys.stdout.write("\r   " + line.ljust(STATUS_LINE_WIDTH))
+                sys.stdout.flush()
+                line_open = True
+            for aid in analysis_ids:
+                status = update['statuses'].get(aid)
+                # Only report changes
+                if status != last_status.get(aid):
+                    last_status[aid] = status
+                    if not live:
+                        print(f"   {aid[:8]}... {status}")
+            
+            if update['finished']:
+                end_line()
+                if all(last_status.get(aid) == 'complete' for aid in analysis_ids):
+                    print("   [OK] All analyses complete!")
+                    return True
+                print("   [ERROR] Some analyses failed")
+                return False
+    except TimeoutError:
+        pass
+    except ConnectionClosed as e:
+        end_line()
+        print(f"   [ERROR] Status WebSocket closed early: {e}")
+        return False
+    finally:
+        ws.close()
+    
+    end_line()
     print("   [TIMEOUT] Processing taking too long")
     return False
 
@@ -146,7 +197,6 @@ def test_assessment_manually():
     print("TESTING LAKE ASSESSMENT WITH MOCK DATA")
     print("=" * 80)
     
-    import sys
     sys.path.insert(0, '.')
     from core.lake_assessment import LakeAssessment
     
@@ -213,8 +263,8 @@ def test_assessment_manually():
     
     # Test trend analysis
     print("\n3. Testing trend analysis:")
-    if lake_assessment.should_perform_assessment(test_reports):
-        assessments = lake_assessment.perform_assessment(test_reports)
+    if lake_assessment.should_perform_assessment(test_reports, groups):
+        assessments = lake_assessment.perform_assessment(test_reports, groups)
         
         for lake_name, assessment_data in assessments.items():
             trend = assessment_data['trend_analysis']
@@ -231,45 +281,57 @@ def test_assessment_manually():
         print("   [INFO] Not enough data for assessment")
 
 if __name__ == "__main__":
-    # Check server
     try:
-        response = requests.get(f"{BASE_URL}/health")
-        if response.status_code != 200:
-            print("Server not healthy!")
+        # Check server - a bodyless HEAD whose connection the upload then reuses
+        try:
+            response = CLIENT.head(f"{BASE_URL}/health", timeout=2)
+            if response.status_code != 200:
+                print("Server not healthy!")
+                exit(1)
+        except httpx.HTTPError:
+            print("Server not running! Start with: python main.py")
             exit(1)
-    except:
-        print("Server not running! Start with: python main.py")
-        exit(1)
     
-    print("Server is running!\n")
+        print("Server is running!\n")
     
-    # Option 1: Test with real upload (may be slow)
-    print("Option 1: Testing with real file upload")
-    submission_id, analysis_ids = simple_trend_test()
+        # Option 1: Test with real upload (may be slow)
+        print("Option 1: Testing with real file upload")
+        submission_id, analysis_ids = simple_trend_test()
     
-    if submission_id and analysis_ids:
-        # Wait a bit for processing
-        if wait_for_completion(analysis_ids):
-            # Check each analysis
-            print("\n3. ANALYSIS RESULTS")
-            print("-" * 40)
-            for aid in analysis_ids:
-                check_analysis_details(aid)
+        if submission_id and analysis_ids:
+            # Wait a bit for processing
+            if wait_for_completion(submission_id, analysis_ids):
+                # Check each analysis
+                print("\n3. ANALYSIS RESULTS")
+                print("-" * 40)
+                for aid in analysis_ids:
+                    check_analysis_details(aid)
             
-            # Try to trigger assessment
-            print("\n4. TRIGGERING LAKE ASSESSMENT")
-            print("-" * 40)
-            response = requests.post(
-                f"{BASE_URL}{API_PREFIX}/meta-analysis/trend",
-                params={"submission_id": submission_id}
-            )
-            if response.status_code == 200:
-                result = response.json()
-                print(f"   Success: {result.get('success')}")
-                print(f"   Message: {result.get('message')}")
-                if result.get('lakes_analyzed'):
-                    print(f"   Lakes: {result.get('lakes_analyzed')}")
+                # Try to trigger assessment
+                print("\n4. TRIGGERING LAKE ASSESSMENT")
+                print("-" * 40)
+                # Uploads of 3+ reports get an assessment scheduled by the server
+                # itself; only trigger one if that didn't produce a result
+                response = CLIENT.get(f"{BASE_URL}{API_PREFIX}/meta-analysis/{submission_id}/status")
+                status = orjson.loads(response.content) if response.status_code == 200 else {}
+                if status.get('assessment_complete'):
+                    print("   Success: True")
+                    print("   Message: Lake Assessment ran automatically after upload")
+                    print(f"   Lakes: {list(status.get('assessment_reports', {}))}")
+                else:
+                    response = CLIENT.post(
+                        f"{BASE_URL}{API_PREFIX}/meta-analysis/trend",
+                        params={"submission_id": submission_id}
+                    )
+                    if response.status_code == 200:
+                        result = orjson.loads(response.content)
+                        print(f"   Success: {result.get('success')}")
+                        print(f"   Message: {result.get('message')}")
+                        if result.get('lakes_analyzed'):
+                            print(f"   Lakes: {result.get('lakes_analyzed')}")
     
-    # Option 2: Test with mock data (instant)
-    print("\nOption 2: Testing with mock data (no upload needed)")
-    test_assessment_manually()
+        # Option 2: Test with mock data (instant)
+        print("\nOption 2: Testing with mock data (no upload needed)")
+        test_assessment_manually()
+    finally:
+        CLIENT.close()
@@ -0,0 +1,54 @@
+"""
+Helpers shared by the trend analysis test scripts
+"""
+
+import os
+import random
+
+# Server configuration
+BASE_URL = "http://localhost:8000"
+API_PREFIX = "/api/v1"
+
+def backoff_delay(attempt):
+    """Exponential poll delay: 0.25s doubling up to 5s, with +/-20% jitter"""
+    return min(5.0, 0.25 * 2 ** attempt) * random.uniform(0.8, 1.2)
+
+def existing_paths(paths):
+    """Subset of paths that exist, listing each parent directory only once"""
+    by_parent = {}
+    for path in paths:
+        by_parent.setdefault(os.path.dirname(path), []).append(path)
+    
+    found = set()
+    for parent, candidates in by_parent.items():
+        try:
+            with os.scandir(parent or ".") as entries:
+                names = {entry.name for entry in entries}
+        except OSError:
+            continue
+        found.update(p for p in candidates if os.path.basename(p) in names)
+    return found
+
+async def fetch_statuses(client, analysis_ids, poll_cache):
+    """
+    Statuses of all analyses from one bulk GET /analyze; None where an
+    analysis is unknown or the request failed. poll_cache keeps the ETag and
+    statuses of the last full response, so an unchanged set of statuses comes
+    back as a bodyless 304 instead of being re-parsed.
+    """
+    etag = poll_cache.get('etag')
+    try:
+        response = await client.get(
+            f"{API_PREFIX}/analyze",
+            params={'ids': ','.join(analysis_ids)},
+            headers={'If-None-Match': etag} if etag else None
+        )
+        if response.status_code == 200:
+            poll_cache['etag'] = response.headers.get('ETag', '')
+            poll_cache['statuses'] = response.json()
+        elif response.status_code != 304:
+            return [None] * len(analysis_ids)
+    except Exception:
+        return [None] * len(analysis_ids)
+    statuses = poll_cache.get('statuses', {})
+    return [statuses.get(aid) for aid in analysis_ids]